@@ -1,23 +1,73 @@
-from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, send_file, make_response
-from flask_sqlalchemy import SQLAlchemy
+from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, send_file, make_response, stream_with_context
+from flask import g, before_render_template, template_rendered
+from markupsafe import Markup
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
 import os
+import time
 from datetime import datetime
 import json
-import matplotlib.pyplot as plt
-import io
+import base64
+import hashlib
+import hmac
+from functools import lru_cache
 import pdfkit
 from urllib.parse import urlparse
-import base64
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from caching import LRUCache, hit_stats
+from config import Config
+from database import count_queries, create_db, insert_ignoring_conflicts
+from fragments import FragmentCacheExtension
+from metrics import metrics
+from passwords import HasherBusy, PasswordHasher
+from sentiment import LexiconScorer
+from report_store import ReportStore
+from report_jobs import DONE as REPORT_DONE, ReportJobQueue
+from charts import FORMATS as CHART_FORMATS, ChartCache, RenderedChart, render_progress_chart
+from export import FORMATS as EXPORT_FORMATS, stream_export
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.urandom(24)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///wellness.db'
-db = SQLAlchemy(app)
+db = create_db(app)
+count_queries(app, db)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
+chart_cache = ChartCache(maxsize=256)
+password_hasher = PasswordHasher.from_config(Config)
+user_cache = LRUCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
+# {% cache %} fragments of base.html (nav, footer), keyed by locale and login state
+app.jinja_env.add_extension(FragmentCacheExtension)
+fragment_cache = LRUCache(maxsize=64)
+if Config.FRAGMENT_CACHE:
+    app.jinja_env.fragment_cache = fragment_cache
+
+@app.template_global()
+def current_locale():
+    return request.accept_languages.best_match(Config.LANGUAGES) or Config.LANGUAGES[0]
+
+# Request and template timings for /metrics
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _record_request(response):
+    endpoint = request.endpoint or 'unmatched'
+    metrics.increment('http_requests', endpoint=endpoint, method=request.method, status=response.status_code)
+    if 'request_started' in g:
+        metrics.observe('http_request', time.perf_counter() - g.request_started, endpoint=endpoint)
+    return response
+
+@before_render_template.connect_via(app)
+def _start_template_timer(sender, template, context, **extra):
+    g.setdefault('template_started', []).append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def _record_template(sender, template, context, **extra):
+    started = g.get('template_started')
+    if started:
+        metrics.observe('render_template', time.perf_counter() - started.pop(), template=template.name)
 
 # User Model
 class User(UserMixin, db.Model):
@@ -31,12 +81,14 @@ class User(UserMixin, db.Model):
     status = db.Column(db.String(20), nullable=True)
     family_history = db.Column(db.Text, nullable=True)
     assessments = db.relationship('Assessment', backref='user', lazy=True)
+    # viewonly so cached users never carry stale stats into a session
+    stats = db.relationship('UserStats', uselist=False, viewonly=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
 # Assessment Model
 class Assessment(db.Model):
@@ -51,11 +103,189 @@ class Assessment(db.Model):
     age = db.Column(db.Integer, nullable=True)
     status = db.Column(db.String(20), nullable=True)
     family_history = db.Column(db.Boolean, nullable=True)
+    # Legacy per-row HTML; new rows reference an interned Recommendation instead
     recommendations = db.Column(db.Text)
+    recommendation_id = db.Column(db.Integer, db.ForeignKey('recommendation.id'), nullable=True)
+
+    @property
+    def recommendation_html(self):
+        if self.recommendation_id is not None:
+            return render_recommendation(self.recommendation_id)
+        return self.recommendations
+
+    # Every history view filters by user and orders by date
+    __table_args__ = (
+        db.Index('ix_assessment_user_date', 'user_id', 'date'),
+    )
+
+# Each distinct recommendations HTML string, stored once and referenced by assessments
+class Recommendation(db.Model):
+    __tablename__ = 'recommendation'
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(40), nullable=False, unique=True)
+    html = db.Column(db.Text, nullable=False)
+
+# content hash -> recommendation id for committed rows
+_recommendation_ids = {}
+
+# One row per completed rescore.py run; the latest id is part of every
+# history fingerprint, so re-scored severities replace cached charts and reports
+class ScoringRun(db.Model):
+    __tablename__ = 'scoring_run'
+    id = db.Column(db.Integer, primary_key=True)
+    finished = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+def intern_recommendation(html):
+    """Return the id of the Recommendation row holding ``html``, creating it if needed."""
+    content_hash = RECOMMENDATION_HASHES.get(html) or hashlib.sha1(html.encode('utf8')).hexdigest()
+    recommendation_id = _recommendation_ids.get(content_hash)
+    if recommendation_id is not None:
+        return recommendation_id
+
+    # Rows created in the current transaction are only memoized once it commits
+    pending = db.session.info.setdefault('pending_recommendations', {})
+    recommendation_id = pending.get(content_hash)
+    if recommendation_id is not None:
+        return recommendation_id
+
+    recommendation_id = db.session.query(Recommendation.id).filter_by(content_hash=content_hash).scalar()
+    if recommendation_id is not None:
+        _recommendation_ids[content_hash] = recommendation_id
+        return recommendation_id
+
+    # If another worker inserts the same text first, this insert is skipped
+    # rather than failing (and with it the caller's transaction)
+    db.session.execute(insert_ignoring_conflicts(Recommendation.__table__, db.session.get_bind().dialect)
+                       .values(content_hash=content_hash, html=html))
+    recommendation_id = db.session.query(Recommendation.id).filter_by(content_hash=content_hash).scalar()
+    pending[content_hash] = recommendation_id
+    return recommendation_id
+
+@db.event.listens_for(db.session, 'after_commit')
+def _memoize_pending_recommendations(session):
+    _recommendation_ids.update(session.info.pop('pending_recommendations', {}))
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _discard_pending_recommendations(session):
+    session.info.pop('pending_recommendations', None)
+
+@db.event.listens_for(db.session, 'before_commit')
+def _start_commit_timer(session):
+    session.info['commit_started'] = time.perf_counter()
+
+@db.event.listens_for(db.session, 'after_commit')
+def _record_commit(session):
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        metrics.observe('db_commit', time.perf_counter() - started)
+
+def render_recommendation(recommendation_id):
+    """Return interned recommendations HTML (None if there is no such row)."""
+    try:
+        return _recommendation_html(recommendation_id)
+    except LookupError:
+        return None
+
+@lru_cache(maxsize=256)
+def _recommendation_html(recommendation_id):
+    # Rows are immutable, so hits are memoized; misses raise, which lru_cache never stores
+    html = db.session.query(Recommendation.html).filter_by(id=recommendation_id).scalar()
+    if html is None:
+        raise LookupError(recommendation_id)
+    return html
+
+# Per-user running aggregates, updated in the same transaction as each new assessment
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    score_sum_sq = db.Column(db.Float, nullable=False, default=0.0)
+    min_score = db.Column(db.Float)
+    max_score = db.Column(db.Float)
+    last_score = db.Column(db.Float)
+    last_severity = db.Column(db.String(20))
+    last_date = db.Column(db.DateTime)
+    last_assessment_id = db.Column(db.Integer)
+    severity_histogram = db.Column(db.JSON, nullable=False, default=dict)
+
+    @property
+    def mean_score(self):
+        return self.score_sum / self.count if self.count else None
+
+    @property
+    def score_stddev(self):
+        if not self.count:
+            return None
+        variance = self.score_sum_sq / self.count - self.mean_score ** 2
+        return max(variance, 0.0) ** 0.5
+
+    @classmethod
+    def for_update(cls, user_id):
+        """Fetch (locking where supported) or create the stats row for a user."""
+        stats = cls.query.filter_by(user_id=user_id).with_for_update().first()
+        if stats is None:
+            # Concurrent first submissions both get here; whichever inserts
+            # second skips its row and then locks the winner's
+            db.session.execute(
+                insert_ignoring_conflicts(cls.__table__, db.session.get_bind().dialect).values(
+                    user_id=user_id, count=0, score_sum=0.0, score_sum_sq=0.0, severity_histogram={}))
+            stats = cls.query.filter_by(user_id=user_id).with_for_update().one()
+        return stats
+
+    def record(self, assessment):
+        """Fold a newly added assessment into the running aggregates."""
+        score = assessment.phq9_score or 0.0
+        self.count += 1
+        self.score_sum += score
+        self.score_sum_sq += score * score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.last_score = score
+        self.last_severity = assessment.depression_severity
+        self.last_date = assessment.date
+        self.last_assessment_id = assessment.id
+        # Assign a new dict so the JSON column is marked dirty
+        histogram = dict(self.severity_histogram or {})
+        histogram[assessment.depression_severity] = histogram.get(assessment.depression_severity, 0) + 1
+        self.severity_histogram = histogram
+
+def add_assessment(assessment):
+    """Add an assessment and update the user's stats; the caller commits both together."""
+    db.session.add(assessment)
+    # Flush to get the id and default date before recording them
+    db.session.flush()
+    UserStats.for_update(assessment.user_id).record(assessment)
+
+# Columns the history views render; selecting only these skips the recommendations blob
+HISTORY_COLUMNS = (Assessment.id, Assessment.date, Assessment.phq9_score, Assessment.depression_severity)
+
+def assessment_history_rows(user_id, descending=False):
+    """Return a user's (id, date, phq9_score, depression_severity) rows ordered by date."""
+    order = (Assessment.date.desc(), Assessment.id.desc()) if descending else (Assessment.date, Assessment.id)
+    return db.session.query(*HISTORY_COLUMNS).filter(Assessment.user_id == user_id).order_by(*order).all()
+
+def cache_user(user):
+    """Keep a detached, column-only copy of ``user`` for load_user."""
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    user_cache.set(user.id, copy)
+
+def invalidate_user(user_id):
+    user_cache.delete(user_id)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        # Attach a copy to this request's session without querying
+        return db.session.merge(cached, load=False)
+    # Load the dashboard's stats in the same round trip
+    user = User.query.options(joinedload(User.stats)).filter_by(id=user_id).first()
+    if user is not None:
+        cache_user(user)
+    return user
 
 @app.route('/')
 def index():
@@ -106,12 +336,18 @@ def signup():
             # Add user to database
             db.session.add(new_user)
             db.session.commit()
+            invalidate_user(new_user.id)
 
             # Log the user in
             login_user(new_user)
             flash('Account created successfully! Welcome!', 'success')
             return redirect(url_for('dashboard'))
 
+        except HasherBusy:
+            db.session.rollback()
+            flash('Too many sign-ups right now. Please try again in a moment.', 'warning')
+            return redirect(url_for('signup'))
+
         except Exception as e:
             db.session.rollback()
             app.logger.error(f"Error during signup: {str(e)}")
@@ -141,6 +377,17 @@ def login():
 
             # Check if user exists and password is correct
             if user and user.check_password(password):
+                # Upgrade hashes made with an older algorithm or cost; when
+                # the hashing pool is full, leave it for a later login
+                if password_hasher.needs_rehash(user.password_hash):
+                    try:
+                        user.set_password(password)
+                    except HasherBusy:
+                        pass
+                    else:
+                        db.session.commit()
+                        invalidate_user(user.id)
+
                 login_user(user, remember=remember)
                 flash('Logged in successfully!', 'success')
 
@@ -153,6 +400,10 @@ def login():
                 flash('Invalid email or password', 'danger')
                 return redirect(url_for('login'))
 
+        except HasherBusy:
+            flash('Too many sign-in attempts right now. Please try again in a moment.', 'warning')
+            return redirect(url_for('login'))
+
         except Exception as e:
             app.logger.error(f"Error during login: {str(e)}")
             flash('An error occurred during login. Please try again.', 'danger')
@@ -198,6 +449,7 @@ def onboarding():
         current_user.status = status
         current_user.family_history = family_history
         db.session.commit()
+        invalidate_user(current_user.id)
 
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('dashboard'))
@@ -243,11 +495,12 @@ def assessment():
             age=age,
             status=status,
             family_history=family_history,
-            recommendations=recommendations
+            recommendation_id=intern_recommendation(recommendations)
         )
         
-        db.session.add(assessment)
+        add_assessment(assessment)
         db.session.commit()
+        chart_cache.invalidate(current_user.id)
         
         return redirect(url_for('results', assessment_id=assessment.id))
     
@@ -287,14 +540,15 @@ def submit_assessment():
             user_id=current_user.id,
             phq9_score=total_score,
             depression_severity=severity,
-            recommendations=recommendations,
+            recommendation_id=intern_recommendation(recommendations),
             age=age,
             status=status,
             family_history=family_history
         )
 
-        db.session.add(assessment)
+        add_assessment(assessment)
         db.session.commit()
+        chart_cache.invalidate(current_user.id)
 
         flash('Assessment submitted successfully!', 'success')
         return redirect(url_for('results'))
@@ -316,88 +570,69 @@ def results(assessment_id):
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    assessments = Assessment.query.filter_by(user_id=current_user.id).all()
-    return render_template('dashboard.html', assessments=assessments)
+    return render_template('dashboard.html', stats=current_user.stats)
 
 @app.route('/reports')
 @login_required
 def reports():
     # Get user's assessments ordered by date
-    assessments = Assessment.query.filter_by(user_id=current_user.id).order_by(Assessment.date).all()
+    assessments = assessment_history_rows(current_user.id)
     
     if not assessments:
         flash('No assessment data available yet.', 'info')
         return render_template('reports.html', has_data=False)
 
-    # Prepare data for the graph
-    dates = []
-    scores = []
-    severities = []
-    
-    for assessment in assessments:
-        dates.append(assessment.date.strftime('%Y-%m-%d'))
-        scores.append(assessment.phq9_score)
-        severities.append(assessment.depression_severity)
-
-    # Create the graph
-    plt.figure(figsize=(10, 6))
-    plt.plot(dates, scores, marker='o', linestyle='-', linewidth=2, markersize=8)
-    
-    # Customize the graph
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.title('Depression Score Progress', fontsize=14, pad=20)
-    plt.xlabel('Assessment Date', fontsize=12)
-    plt.ylabel('Depression Score (0-10)', fontsize=12)
-    
-    # Set y-axis range to 0-10
-    plt.ylim(0, 10)
-    
-    # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-    
-    # Add score labels on points
-    for i, score in enumerate(scores):
-        plt.annotate(f'{score:.1f}', (i, score), textcoords="offset points", xytext=(0,10), ha='center')
-
-    # Color points based on severity
-    severity_colors = {
-        'Mild': 'green',
-        'Moderate': 'orange',
-        'Severe': 'red'
-    }
-    
-    for i, (severity, score) in enumerate(zip(severities, scores)):
-        plt.plot(i, score, 'o', color=severity_colors.get(severity, 'blue'), markersize=10)
-
-    # Add horizontal lines for severity thresholds
-    plt.axhline(y=3, color='lightgreen', linestyle='--', alpha=0.5)
-    plt.axhline(y=7, color='orange', linestyle='--', alpha=0.5)
-
-    # Add legend
-    legend_elements = [
-        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='green', label='Mild (0-3)', markersize=10),
-        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='orange', label='Moderate (4-7)', markersize=10),
-        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', label='Severe (8-10)', markersize=10)
-    ]
-    plt.legend(handles=legend_elements, title='Depression Severity', loc='center left', bbox_to_anchor=(1, 0.5))
-
-    # Adjust layout to prevent label cutoff
-    plt.tight_layout()
-
-    # Save plot to buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close()
-    buf.seek(0)
-    
-    # Convert plot to base64 string
-    plot_url = base64.b64encode(buf.getvalue()).decode('utf8')
-
+    # The chart itself is served (and cached) by progress_chart
     return render_template('reports.html', 
                          assessments=assessments,
-                         plot_url=plot_url,
                          has_data=True)
 
+def assessment_fingerprint(user_id):
+    """Summarize a user's assessment series as (count, latest id, latest date, latest scoring run)."""
+    return db.session.query(
+        db.func.count(Assessment.id),
+        db.func.max(Assessment.id),
+        db.func.max(Assessment.date),
+        db.select(db.func.max(ScoringRun.id)).scalar_subquery()
+    ).filter(Assessment.user_id == user_id).one()
+
+def assessment_version(user_id):
+    """Return (fingerprint, latest date) of a user's assessment history, or (None, None) if empty."""
+    count, latest_id, latest_date, scoring_run = assessment_fingerprint(user_id)
+    if not count:
+        return None, None
+    return f'{count}:{latest_id}:{latest_date.isoformat() if latest_date else ""}:{scoring_run or 0}', latest_date
+
+@app.route('/reports/chart.<fmt>')
+@login_required
+def progress_chart(fmt):
+    if fmt not in CHART_FORMATS:
+        return '', 404
+    fingerprint, latest_date = assessment_version(current_user.id)
+    if fingerprint is None:
+        return '', 404
+
+    chart = chart_cache.get(current_user.id, fingerprint, fmt)
+    if chart is None:
+        assessments = assessment_history_rows(current_user.id)
+        dates = [assessment.date.strftime('%Y-%m-%d') for assessment in assessments]
+        scores = [assessment.phq9_score for assessment in assessments]
+        severities = [assessment.depression_severity for assessment in assessments]
+        with metrics.span('render_chart', fmt=fmt):
+            data = render_progress_chart(dates, scores, severities, fmt)
+        chart = RenderedChart(fingerprint, data, fmt, latest_date)
+        chart_cache.put(current_user.id, chart)
+
+    response = make_response(chart.data)
+    response.mimetype = chart.mimetype
+    response.set_etag(chart.etag)
+    if chart.last_modified:
+        response.last_modified = chart.last_modified
+    # Private to the user, and revalidated on every view so new assessments show up
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 def calculate_svm_confidence(phq9_score):
     """Calculate SVM model confidence based on PHQ-9 score."""
     if phq9_score <= 3:
@@ -407,18 +642,17 @@ def calculate_svm_confidence(phq9_score):
     else:
         return 0.80  # Lower confidence for severe cases
 
+# Keyword lexicon for analyze_sentiment, compiled once at import
+NEGATIVE_WORDS = ['sad', 'depressed', 'hopeless', 'worthless', 'tired', 'suicide', 'death']
+POSITIVE_WORDS = ['hope', 'better', 'good', 'happy', 'positive', 'improving']
+sentiment_scorer = LexiconScorer.from_lists(POSITIVE_WORDS, NEGATIVE_WORDS)
+
+@metrics.timed('analyze_sentiment')
 def analyze_sentiment(text):
     """Analyze sentiment of written response using LSTM model."""
     # This is a simplified example - in practice, you'd use your trained LSTM model
-    # Here we're using basic keyword matching for demonstration
-    negative_words = ['sad', 'depressed', 'hopeless', 'worthless', 'tired', 'suicide', 'death']
-    positive_words = ['hope', 'better', 'good', 'happy', 'positive', 'improving']
-    
-    text = text.lower()
-    neg_count = sum(1 for word in negative_words if word in text)
-    pos_count = sum(1 for word in positive_words if word in text)
-    
-    total_words = len(text.split())
+    # Here we're using weighted keyword matching (with negation) for demonstration
+    pos_count, neg_count, total_words = sentiment_scorer.score(text)
     if total_words == 0:
         return 'Neutral', 0.5
     
@@ -431,19 +665,44 @@ def analyze_sentiment(text):
     else:
         return 'Neutral', 0.7
 
+SEVERITY_LEVELS = ('Minimal', 'Mild', 'Moderate', 'Moderately Severe', 'Severe')
+
 def adjust_severity_by_sentiment(severity, sentiment):
     """Adjust depression severity based on sentiment analysis."""
-    severity_levels = ['Minimal', 'Mild', 'Moderate', 'Moderately Severe', 'Severe']
-    
     if sentiment == 'Negative':
-        current_index = severity_levels.index(severity)
-        if current_index < len(severity_levels) - 1:
-            return severity_levels[current_index + 1]
+        current_index = SEVERITY_LEVELS.index(severity)
+        if current_index < len(SEVERITY_LEVELS) - 1:
+            return SEVERITY_LEVELS[current_index + 1]
     
     return severity
 
+SEVERITY_BADGE_CLASSES = {'Mild': 'bg-success', 'Moderate': 'bg-warning'}
+
+def _severity_badge(severity):
+    return Markup('<span class="badge {}">{}</span>').format(
+        SEVERITY_BADGE_CLASSES.get(severity, 'bg-danger'), severity)
+
+SEVERITY_BADGES = {severity: _severity_badge(severity) for severity in SEVERITY_LEVELS}
+
+@app.template_global()
+def severity_badge(severity):
+    """Badge markup for a severity, precomputed for the known levels."""
+    badge = SEVERITY_BADGES.get(severity)
+    return badge if badge is not None else _severity_badge(severity)
+
+RECOMMENDATION_STATUSES = ('student', 'working_women', 'housewife')
+
 def generate_recommendations(severity, status, age):
     """Generate personalized recommendations based on severity and status."""
+    # Every (severity, status) the forms can produce is built once at import
+    if status not in RECOMMENDATION_STATUSES:
+        status = None
+    recommendations = RECOMMENDATIONS.get((severity, status))
+    if recommendations is None:
+        recommendations = _build_recommendations(severity, status)
+    return recommendations
+
+def _build_recommendations(severity, status):
     base_recommendations = """
     <h5 class="mb-3">General Recommendations:</h5>
     <ul>
@@ -506,80 +765,331 @@ def get_depression_severity(score):
     else:
         return "Severe"
 
+SEVERITY_RECOMMENDATIONS = {
+    "Mild": "Your symptoms suggest mild depression. Consider practicing self-care techniques and talking to friends or family about your feelings. Regular exercise and mindfulness can be helpful.",
+    "Moderate": "Your symptoms indicate moderate depression. It's recommended to schedule a consultation with a mental health professional. Regular counseling and lifestyle changes may be beneficial.",
+    "Severe": "Your symptoms suggest severe depression. Please seek professional help as soon as possible. A mental health specialist can help develop an appropriate treatment plan."
+}
+DEFAULT_RECOMMENDATION = "Please consult with a mental health professional for personalized advice."
+
 def get_recommendations(severity):
-    recommendations = {
-        "Mild": "Your symptoms suggest mild depression. Consider practicing self-care techniques and talking to friends or family about your feelings. Regular exercise and mindfulness can be helpful.",
-        "Moderate": "Your symptoms indicate moderate depression. It's recommended to schedule a consultation with a mental health professional. Regular counseling and lifestyle changes may be beneficial.",
-        "Severe": "Your symptoms suggest severe depression. Please seek professional help as soon as possible. A mental health specialist can help develop an appropriate treatment plan."
+    return SEVERITY_RECOMMENDATIONS.get(severity, DEFAULT_RECOMMENDATION)
+
+RECOMMENDATIONS = {(severity, status): _build_recommendations(severity, status)
+                   for severity in SEVERITY_LEVELS for status in RECOMMENDATION_STATUSES + (None,)}
+
+# Content hashes of every precomputed fragment, so interning them skips hashing
+RECOMMENDATION_HASHES = {
+    html: hashlib.sha1(html.encode('utf8')).hexdigest()
+    for html in [*RECOMMENDATIONS.values(), *SEVERITY_RECOMMENDATIONS.values(), DEFAULT_RECOMMENDATION]
+}
+
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGE_SIZE = 1000
+
+def encode_history_cursor(row):
+    return base64.urlsafe_b64encode(f'{row.date.isoformat()}|{row.id}'.encode('utf8')).decode('ascii')
+
+def decode_history_cursor(cursor):
+    date, assessment_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf8').split('|')
+    return datetime.fromisoformat(date), int(assessment_id)
+
+def history_item(row):
+    return {
+        'id': row.id,
+        'date': row.date.strftime('%Y-%m-%d'),
+        'timestamp': row.date.isoformat(),
+        'score': row.phq9_score,
+        'depression_severity': row.depression_severity
     }
-    return recommendations.get(severity, "Please consult with a mental health professional for personalized advice.")
 
 @app.route('/api/assessment_history')
 @login_required
 def assessment_history():
-    assessments = Assessment.query.filter_by(user_id=current_user.id).order_by(Assessment.date).all()
-    history = [{
-        'date': assessment.date.strftime('%Y-%m-%d'),
-        'score': assessment.phq9_score,
-        'depression_severity': assessment.depression_severity
-    } for assessment in assessments]
-    return jsonify(history)
+    """Return the user's history in (date, id) order.
+
+    Without ``limit`` or ``cursor`` the response is the whole history as one
+    JSON list, as it always was. With either, it is a page
+    ``{"items": [...], "next_cursor": ...}``: ``limit`` sets the page size
+    and ``cursor`` is the previous page's ``next_cursor``. ``since`` (ISO
+    date/time) keeps only newer rows, and ``format=ndjson`` streams one JSON
+    object per line instead.
+    """
+    try:
+        limit = min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        after = decode_history_cursor(cursor) if cursor else None
+        since = request.args.get('since')
+        since = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        return jsonify({'error': 'Invalid limit, cursor or since parameter'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    stream = request.args.get('format') == 'ndjson'
+    paged = 'limit' in request.args or cursor is not None
+
+    # The history only changes when an assessment is added, so the version
+    # plus the query string identifies the response
+    version, _ = assessment_version(current_user.id)
+    etag = hashlib.sha1(f'{version}?{request.query_string.decode()}'.encode('utf8')).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    query = db.session.query(*HISTORY_COLUMNS).filter(Assessment.user_id == current_user.id)
+    if since is not None:
+        query = query.filter(Assessment.date > since)
+    if after is not None:
+        after_date, after_id = after
+        query = query.filter(db.or_(
+            Assessment.date > after_date,
+            db.and_(Assessment.date == after_date, Assessment.id > after_id)
+        ))
+    query = query.order_by(Assessment.date, Assessment.id)
+
+    if stream:
+        if 'limit' in request.args:
+            query = query.limit(limit)
+        rows = query.yield_per(500)
+
+        def generate():
+            for row in rows:
+                yield json.dumps(history_item(row)) + '\n'
+
+        response = app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    elif not paged:
+        response = jsonify([history_item(row) for row in query.all()])
+    else:
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        response = jsonify({
+            'items': [history_item(row) for row in rows],
+            'next_cursor': encode_history_cursor(rows[-1]) if has_more else None
+        })
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+# Everything but the recommendations HTML, in the order exports write it
+EXPORT_COLUMNS = (Assessment.id, Assessment.user_id, Assessment.date, Assessment.phq9_score,
+                  Assessment.depression_severity, Assessment.svm_confidence, Assessment.lstm_confidence,
+                  Assessment.sentiment, Assessment.age, Assessment.status, Assessment.family_history)
+
+def export_query(user_id=None, since=None, until=None, severities=None):
+    """Query for assessments to export; ``since`` is inclusive, ``until`` exclusive."""
+    query = db.session.query(*EXPORT_COLUMNS)
+    if user_id is not None:
+        # ix_assessment_user_date serves both the filter and the order
+        query = query.filter(Assessment.user_id == user_id).order_by(Assessment.date, Assessment.id)
+    else:
+        query = query.order_by(Assessment.id)
+    if since is not None:
+        query = query.filter(Assessment.date >= since)
+    if until is not None:
+        query = query.filter(Assessment.date < until)
+    if severities:
+        query = query.filter(Assessment.depression_severity.in_(severities))
+    return query
+
+def bearer_token_matches(token):
+    """True if the request sends ``Authorization: Bearer <token>``"""
+    return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+
+def export_response(user_id):
+    """Stream an export filtered by ``user_id`` (None: everyone) and the query string."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        since = request.args.get('since')
+        since = datetime.fromisoformat(since) if since else None
+        until = request.args.get('until')
+        until = datetime.fromisoformat(until) if until else None
+    except ValueError:
+        return jsonify({'error': 'Invalid since or until parameter'}), 400
+    compress = request.args.get('gzip') == '1'
+
+    query = export_query(user_id, since, until, request.args.getlist('severity'))
+    filename = f'assessments.{fmt}' + ('.gz' if compress else '')
+    # No Content-Length, so the body goes out with chunked transfer encoding
+    response = app.response_class(stream_with_context(stream_export(query, fmt, compress)),
+                                  mimetype='application/gzip' if compress else EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    return response
+
+@app.route('/export/assessments')
+@login_required
+def export_assessments():
+    """Download the user's assessments.
+
+    Query parameters: ``format`` (``csv`` or ``ndjson``), ``since`` and
+    ``until`` (ISO date/time), ``severity`` (repeatable) and ``gzip=1``.
+    """
+    return export_response(current_user.id)
+
+@app.route('/admin/export/assessments')
+def admin_export_assessments():
+    """Download every user's assessments (or one user's with ``user_id``); same parameters.
+
+    Needs ``Authorization: Bearer <EXPORT_ADMIN_TOKEN>``; not served when no token is set.
+    """
+    if not Config.EXPORT_ADMIN_TOKEN:
+        return '', 404
+    if not bearer_token_matches(Config.EXPORT_ADMIN_TOKEN):
+        return jsonify({'error': 'Unauthorized'}), 401
+    return export_response(request.args.get('user_id', type=int))
 
 @app.route('/mindful_activities')
 @login_required
 def mindful_activities():
     return render_template('mindful_activities.html')
 
+def build_report_html(user, assessments):
+    """Render the PDF report HTML for a user's assessments (newest first)."""
+    # Prepare data for the report
+    assessment_data = []
+    dates = []
+    scores = []
+    
+    for assessment in assessments:
+        dates.append(assessment.date.strftime('%Y-%m-%d'))
+        scores.append(assessment.phq9_score)
+        assessment_data.append({
+            'date': assessment.date.strftime('%Y-%m-%d'),
+            'score': assessment.phq9_score,
+            'severity': assessment.depression_severity,
+            'recommendations': assessment.recommendation_html
+        })
+    
+    # Create a PDF using a template
+    return render_template(
+        'report_template.html',
+        user=user,
+        assessments=assessment_data,
+        dates=dates,
+        scores=scores,
+        latest=assessments[0] if assessments else None
+    )
+
+def report_filename():
+    return f'depression_assessment_report_{datetime.now().strftime("%Y%m%d")}.pdf'
+
+report_store = ReportStore(os.path.join(app.instance_path, 'report_cache'))
+
+def recommendation_cache_stats():
+    info = _recommendation_html.cache_info()
+    return hit_stats(info.hits, info.misses)
+
+metrics.register_cache('user', user_cache.stats)
+metrics.register_cache('chart', chart_cache.stats)
+metrics.register_cache('report', report_store.stats)
+metrics.register_cache('recommendation', recommendation_cache_stats)
+metrics.register_cache('fragment', fragment_cache.stats)
+
+def build_report_pdf(user):
+    """Return the path of the user's PDF report, rendering it only if their history changed."""
+    fingerprint, _ = assessment_version(user.id)
+    if fingerprint is None:
+        return None
+
+    path = report_store.get(user.id, fingerprint)
+    if path is None:
+        assessments = Assessment.query.filter_by(user_id=user.id).order_by(Assessment.date.desc()).all()
+        html_content = build_report_html(user, assessments)
+        
+        # Generate PDF
+        with metrics.span('pdfkit'):
+            pdf = pdfkit.from_string(html_content, False)
+        path = report_store.put(user.id, fingerprint, pdf)
+    return path
+
 @app.route('/download_report')
 @login_required
 def download_report():
     try:
-        # Get user's assessments
-        assessments = Assessment.query.filter_by(user_id=current_user.id).order_by(Assessment.date.desc()).all()
+        path = build_report_pdf(current_user)
         
-        if not assessments:
+        if path is None:
             flash('No assessment data available to generate report.', 'warning')
             return redirect(url_for('reports'))
-            
-        # Prepare data for the report
-        assessment_data = []
-        dates = []
-        scores = []
-        
-        for assessment in assessments:
-            dates.append(assessment.date.strftime('%Y-%m-%d'))
-            scores.append(assessment.phq9_score)
-            assessment_data.append({
-                'date': assessment.date.strftime('%Y-%m-%d'),
-                'score': assessment.phq9_score,
-                'severity': assessment.depression_severity,
-                'recommendations': assessment.recommendations
-            })
-        
-        # Create a PDF using a template
-        html_content = render_template(
-            'report_template.html',
-            user=current_user,
-            assessments=assessment_data,
-            dates=dates,
-            scores=scores,
-            latest=assessments[0] if assessments else None
-        )
-        
-        # Generate PDF
-        pdf = pdfkit.from_string(html_content, False)
-        
-        # Create response
-        response = make_response(pdf)
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=depression_assessment_report_{datetime.now().strftime("%Y%m%d")}.pdf'
         
-        return response
+        # Conditional GET and Range requests are handled by send_file
+        return send_file(path, mimetype='application/pdf', as_attachment=True,
+                         download_name=report_filename(), conditional=True)
         
     except Exception as e:
         flash('Error generating report. Please try again.', 'danger')
         return redirect(url_for('reports'))
 
+def render_report_pdf(user_id):
+    """Build a user's PDF report on a report job thread."""
+    with app.app_context():
+        try:
+            path = build_report_pdf(db.session.get(User, user_id))
+        except Exception as e:
+            app.logger.error(f"Error generating report for user {user_id}: {str(e)}")
+            raise
+        if path is None:
+            raise ValueError('No assessment data available to generate report.')
+        return path
+
+report_jobs = ReportJobQueue(render_report_pdf,
+                             output_dir=os.path.join(app.instance_path, 'reports'),
+                             max_workers=2)
+
+def report_job_status(job):
+    status = job.to_dict()
+    status['status_url'] = url_for('report_status', job_id=job.id)
+    if job.status == REPORT_DONE:
+        status['download_url'] = url_for('download_report_file', job_id=job.id)
+    return status
+
+@app.route('/reports/pdf', methods=['POST'])
+@login_required
+def request_report():
+    if not db.session.query(Assessment.id).filter_by(user_id=current_user.id).first():
+        return jsonify({'error': 'No assessment data available to generate report.'}), 404
+    job = report_jobs.submit(current_user.id)
+    return jsonify(report_job_status(job)), 202
+
+@app.route('/reports/pdf/<job_id>')
+@login_required
+def report_status(job_id):
+    job = report_jobs.get(job_id)
+    if job is None or job.user_id != current_user.id:
+        return jsonify({'error': 'Report not found'}), 404
+    return jsonify(report_job_status(job))
+
+@app.route('/reports/pdf/<job_id>/download')
+@login_required
+def download_report_file(job_id):
+    job = report_jobs.get(job_id)
+    if job is None or job.user_id != current_user.id:
+        return jsonify({'error': 'Report not found'}), 404
+    if job.status != REPORT_DONE:
+        return jsonify(report_job_status(job)), 409
+    if not os.path.exists(job.path):
+        # Pruned (or removed by hand) since the job finished; request a new report
+        return jsonify({'error': 'Report expired'}), 410
+    return send_file(job.path, mimetype='application/pdf', as_attachment=True,
+                     download_name=report_filename())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint, behind METRICS_TOKEN unless METRICS_PUBLIC is set."""
+    if Config.METRICS_TOKEN:
+        if not bearer_token_matches(Config.METRICS_TOKEN):
+            return '', 401
+    elif not Config.METRICS_PUBLIC:
+        return '', 404
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
@@ -0,0 +1,72 @@
+"""Compare the old pyplot progress chart with charts.render_progress_chart.
+
+Run from the repository root:
+
+    python -m benchmarks.charts
+"""
+import argparse
+import io
+import random
+import timeit
+from datetime import date, timedelta
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from charts import render_progress_chart
+
+def legacy_render(dates, scores, severities):
+    """The pyplot state-machine version reports() used to run, kept as the baseline"""
+    plt.figure(figsize=(10, 6))
+    plt.plot(dates, scores, marker='o', linestyle='-', linewidth=2, markersize=8)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.title('Depression Score Progress', fontsize=14, pad=20)
+    plt.xlabel('Assessment Date', fontsize=12)
+    plt.ylabel('Depression Score (0-10)', fontsize=12)
+    plt.ylim(0, 10)
+    plt.xticks(rotation=45)
+    for i, score in enumerate(scores):
+        plt.annotate(f'{score:.1f}', (i, score), textcoords="offset points", xytext=(0,10), ha='center')
+    severity_colors = {'Mild': 'green', 'Moderate': 'orange', 'Severe': 'red'}
+    for i, (severity, score) in enumerate(zip(severities, scores)):
+        plt.plot(i, score, 'o', color=severity_colors.get(severity, 'blue'), markersize=10)
+    plt.axhline(y=3, color='lightgreen', linestyle='--', alpha=0.5)
+    plt.axhline(y=7, color='orange', linestyle='--', alpha=0.5)
+    legend_elements = [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='green', label='Mild (0-3)', markersize=10),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='orange', label='Moderate (4-7)', markersize=10),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='red', label='Severe (8-10)', markersize=10)
+    ]
+    plt.legend(handles=legend_elements, title='Depression Severity', loc='center left', bbox_to_anchor=(1, 0.5))
+    plt.tight_layout()
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png', bbox_inches='tight')
+    plt.close()
+    return buf.getvalue()
+
+def make_series(count, rng):
+    start = date(2020, 1, 1)
+    dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(count)]
+    scores = [round(rng.uniform(0, 10), 1) for _ in range(count)]
+    severities = ['Mild' if s <= 3 else 'Moderate' if s <= 7 else 'Severe' for s in scores]
+    return dates, scores, severities
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'points':>7}{'pyplot ms':>12}{'png ms':>10}{'svg ms':>10}{'speedup':>9}")
+    for size in args.sizes:
+        series = make_series(size, rng)
+        legacy = min(timeit.repeat(lambda: legacy_render(*series), number=1, repeat=args.repeat)) * 1000
+        png = min(timeit.repeat(lambda: render_progress_chart(*series), number=1, repeat=args.repeat)) * 1000
+        svg = min(timeit.repeat(lambda: render_progress_chart(*series, fmt='svg'),
+                                number=1, repeat=args.repeat)) * 1000
+        print(f"{size:>7}{legacy:>12.1f}{png:>10.1f}{svg:>10.1f}{legacy / png:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import pytest
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "micro: pytest-benchmark micro-benchmark, skipped unless selected with -m micro")
+
+def pytest_collection_modifyitems(config, items):
+    # Opt-in: plain test runs should not spend minutes timing calls
+    if 'micro' in (config.getoption('markexpr') or ''):
+        return
+    skip = pytest.mark.skip(reason="micro-benchmark; select with -m micro")
+    for item in items:
+        if 'micro' in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,71 @@
+"""Feature extraction speed: per-row dict loop vs FeaturePipeline.
+
+Builds the SVM feature matrix for N synthetic assessment forms the old way
+(one dict and one list per row) and with FeaturePipeline from a list of
+dicts and from a DataFrame. Run from the repository root:
+
+    python -m benchmarks.features --rows 1000 10000 100000
+"""
+import argparse
+import random
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from features import FeaturePipeline
+
+def make_forms(rng, count):
+    return [
+        dict({f'q{i}': str(rng.randint(0, 3)) for i in range(1, 10)},
+             age=str(rng.randint(18, 80)),
+             work_interference=rng.choice(['never', 'rarely', 'sometimes', 'often', 'always']),
+             family_history=rng.choice(['true', 'false']),
+             self_employed=rng.choice(['true', 'false']))
+        for _ in range(count)
+    ]
+
+def legacy_matrix(forms):
+    """extract_features_from_form followed by the old hand-built array"""
+    features_list = [
+        {
+            'phq_score': sum(int(form.get(f'q{i}', 0)) for i in range(1, 10)),
+            'age': int(form.get('age', 25)),
+            'work_interference': form.get('work_interference', 'never'),
+            'family_history': form.get('family_history') == 'true',
+            'self_employed': form.get('self_employed') == 'true'
+        }
+        for form in forms
+    ]
+    return np.array([
+        [
+            features['phq_score'],
+            1 if features['work_interference'] in ['often', 'always'] else 0,
+            1 if features['family_history'] else 0,
+            1 if features['self_employed'] else 0,
+            features['age']
+        ]
+        for features in features_list
+    ], dtype=float)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pipeline = FeaturePipeline()
+    rng = random.Random(0)
+    print(f"{'rows':>8}{'legacy ms':>12}{'dicts ms':>11}{'frame ms':>11}")
+    for count in args.rows:
+        forms = make_forms(rng, count)
+        frame = pd.DataFrame(forms)
+        assert np.array_equal(legacy_matrix(forms), pipeline.transform(frame))
+        timings = [
+            min(timeit.repeat(lambda: build(data), number=1, repeat=args.repeat)) * 1000
+            for build, data in ((legacy_matrix, forms), (pipeline.transform, forms), (pipeline.transform, frame))
+        ]
+        print(f"{count:>8}" + ''.join(f"{ms:>11.1f} " for ms in timings))
+
+if __name__ == '__main__':
+    main()
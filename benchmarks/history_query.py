@@ -0,0 +1,98 @@
+"""Time per-user assessment history queries with and without the (user_id, date) index.
+
+Seeds a throwaway SQLite database, then compares full ORM rows against
+the column-only query the history views use. Run from the repository root:
+
+    python -m benchmarks.history_query --rows 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app import Assessment, HISTORY_COLUMNS, User, db, generate_recommendations
+
+def seed(path, rows, users):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine, tables=[User.__table__, Assessment.__table__])
+    engine.dispose()
+
+    rng = random.Random(0)
+    blob = generate_recommendations('Severe', 'student', 25)
+    start = datetime(2020, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.executemany('INSERT INTO user (id, name, email, gender) VALUES (?, ?, ?, ?)',
+                     ((i, f'user{i}', f'user{i}@example.com', 'female') for i in range(1, users + 1)))
+    batch = []
+    for i in range(rows):
+        score = round(rng.uniform(0, 10), 1)
+        batch.append((rng.randint(1, users), start + timedelta(minutes=rng.randint(0, 2_000_000)),
+                      score, 'Mild' if score <= 3 else 'Moderate' if score <= 7 else 'Severe', blob))
+        if len(batch) == 50000:
+            conn.executemany('INSERT INTO assessment (user_id, date, phq9_score, depression_severity, recommendations) '
+                             'VALUES (?, ?, ?, ?, ?)', batch)
+            batch = []
+    if batch:
+        conn.executemany('INSERT INTO assessment (user_id, date, phq9_score, depression_severity, recommendations) '
+                         'VALUES (?, ?, ?, ?, ?)', batch)
+    conn.commit()
+    conn.close()
+
+def time_queries(engine, user_ids):
+    results = {}
+    with Session(engine) as session:
+        started = time.perf_counter()
+        for user_id in user_ids:
+            session.query(Assessment).filter_by(user_id=user_id).order_by(Assessment.date).all()
+            session.expunge_all()
+        results['orm'] = (time.perf_counter() - started) / len(user_ids) * 1000
+
+        started = time.perf_counter()
+        for user_id in user_ids:
+            session.query(*HISTORY_COLUMNS).filter(Assessment.user_id == user_id) \
+                .order_by(Assessment.date, Assessment.id).all()
+        results['columns'] = (time.perf_counter() - started) / len(user_ids) * 1000
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--keep', metavar='PATH', help="Write the database here and keep it")
+    args = parser.parse_args()
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(), 'history_bench.db')
+    print(f"Seeding {args.rows:,} assessments for {args.users:,} users into {path} ...")
+    started = time.perf_counter()
+    seed(path, args.rows, args.users)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    engine = create_engine(f'sqlite:///{path}')
+    user_ids = random.Random(1).sample(range(1, args.users + 1), min(args.queries, args.users))
+
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX IF EXISTS ix_assessment_user_date'))
+    without_index = time_queries(engine, user_ids)
+
+    with engine.begin() as conn:
+        conn.execute(text('CREATE INDEX ix_assessment_user_date ON assessment (user_id, date)'))
+        conn.execute(text('ANALYZE'))
+    with_index = time_queries(engine, user_ids)
+
+    print(f"\n{'ms per user history':<22}{'full ORM':>10}{'columns':>10}")
+    print(f"{'no index':<22}{without_index['orm']:>10.2f}{without_index['columns']:>10.2f}")
+    print(f"{'(user_id, date) index':<22}{with_index['orm']:>10.2f}{with_index['columns']:>10.2f}")
+
+    engine.dispose()
+    if not args.keep:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
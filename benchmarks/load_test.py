@@ -0,0 +1,318 @@
+"""End-to-end throughput and latency of the main routes.
+
+Seeds a throwaway SQLite database with synthetic users and assessments,
+then drives each route with concurrent clients and reports requests/sec and
+latency percentiles per route. By default requests go through the Flask test
+client in this process; --http starts gunicorn on the seeded database and
+sends real HTTP requests instead. When wkhtmltopdf is not installed a stub
+that returns a one-page PDF is put on the PATH, so download_report is
+measured without it. Results are written as JSON for comparing runs. Run
+from the repository root:
+
+    python -m benchmarks.load_test --users 200 --assessments 50 --requests 500 --output before.json
+    python -m benchmarks.load_test --http --workers 4 --concurrency 16 --output after.json
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+
+ROUTES = ('signup', 'login', 'assessment', 'dashboard', 'reports', 'assessment_history', 'download_report')
+
+PASSWORD = 'load-test-password'
+
+STUB_PDF = (b'%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+            b'2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n'
+            b'3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n'
+            b'trailer<</Root 1 0 R>>\n%EOF\n')
+
+def stub_wkhtmltopdf(directory):
+    """Put a fake wkhtmltopdf on the PATH unless a real one is installed; return True if stubbed"""
+    if shutil.which('wkhtmltopdf'):
+        return False
+    pdf_path = os.path.join(directory, 'stub.pdf')
+    with open(pdf_path, 'wb') as f:
+        f.write(STUB_PDF)
+    path = os.path.join(directory, 'wkhtmltopdf')
+    with open(path, 'w') as f:
+        # pdfkit pipes the HTML in on stdin and reads the PDF from stdout
+        f.write(f'#!/bin/sh\ncat > /dev/null\ncat "{pdf_path}"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    os.environ['PATH'] = directory + os.pathsep + os.environ['PATH']
+    return True
+
+def seed(users, assessments_per_user):
+    """Fill the database named by DATABASE_URL with synthetic users and assessments"""
+    from sqlalchemy import insert
+
+    from app import (Assessment, User, app, db, generate_recommendations, get_depression_severity,
+                     intern_recommendation, password_hasher)
+    from rebuild_stats import rebuild
+
+    rng = random.Random(0)
+    statuses = ['Housewife', 'Working Women', 'Student']
+    with app.app_context():
+        db.create_all()
+        # One hash for everyone: hashing thousands of passwords would dominate seeding
+        password_hash = password_hasher.hash(PASSWORD)
+        db.session.execute(insert(User), [
+            {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': password_hash,
+             'gender': 'female', 'age': rng.randint(18, 70), 'status': rng.choice(statuses),
+             'family_history': rng.choice(['yes', 'no'])}
+            for i in range(1, users + 1)])
+        recommendations = {
+            (severity, status): intern_recommendation(generate_recommendations(severity, status, 30))
+            for severity in ('Mild', 'Moderate', 'Severe') for status in statuses
+        }
+        start = datetime(2023, 1, 1)
+        rows = []
+        for user_id in range(1, users + 1):
+            for n in range(assessments_per_user):
+                score = rng.randint(0, 27)
+                severity = get_depression_severity(score)
+                status = rng.choice(statuses)
+                rows.append({
+                    'user_id': user_id, 'date': start + timedelta(days=n, seconds=user_id),
+                    'phq9_score': score, 'depression_severity': severity,
+                    'svm_confidence': 0.85, 'lstm_confidence': rng.random(),
+                    'sentiment': rng.choice(['Positive', 'Negative', 'Neutral']),
+                    'age': 30, 'status': status, 'family_history': rng.random() < 0.5,
+                    'recommendation_id': recommendations[(severity, status)]
+                })
+        for offset in range(0, len(rows), 10000):
+            db.session.execute(insert(Assessment), rows[offset:offset + 10000])
+        db.session.commit()
+        with db.engine.begin() as conn:
+            rebuild(conn)
+
+def assessment_form(rng):
+    form = {f'q{i}': str(rng.randint(0, 3)) for i in range(1, 10)}
+    form.update(age=str(rng.randint(18, 70)), status='Student', family_history='false',
+                written_response=rng.choice(['I feel hopeless and tired', 'Things are getting better',
+                                             'Nothing much to report']))
+    return form
+
+class TestClientSession:
+    """One user's cookie session through the Flask test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self.client.open(path, method=method, data=data)
+        response.close()
+        return response.status_code
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+class HTTPSession:
+    """One user's cookie session over real HTTP (redirects are not followed, like the test client)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+def make_request(route, user, iteration, rng):
+    """Return (method, path, form data, needs a logged-in session) for one request to ``route``"""
+    if route == 'signup':
+        email = f'signup-{user}-{iteration}-{rng.random()}@example.com'
+        return 'POST', '/signup', {'name': email, 'email': email, 'password': PASSWORD,
+                                   'gender': 'female'}, False
+    if route == 'login':
+        return 'POST', '/login', {'email': f'user{user}@example.com', 'password': PASSWORD}, False
+    if route == 'assessment':
+        return 'POST', '/assessment', assessment_form(rng), True
+    if route == 'assessment_history':
+        return 'GET', '/api/assessment_history?limit=100', None, True
+    return 'GET', '/' + route, None, True
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def run_route(route, new_session, users, concurrency, requests, warmup):
+    """Drive ``route`` from ``concurrency`` threads; return its stats"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    # Clients log in and warm up, then all start measuring together
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(index):
+        rng = random.Random(index)
+        user = index % users + 1
+        session = new_session()
+        session.request('POST', '/login', {'email': f'user{user}@example.com', 'password': PASSWORD})
+        count = requests // concurrency + (1 if index < requests % concurrency else 0)
+        local_latencies, local_errors = [], []
+        for iteration in range(-warmup, count):
+            if iteration == 0:
+                barrier.wait()
+            method, path, data, logged_in = make_request(route, user, iteration, rng)
+            client = session if logged_in else new_session()
+            started = time.perf_counter()
+            status = client.request(method, path, data)
+            elapsed = time.perf_counter() - started
+            if iteration >= 0:
+                local_latencies.append(elapsed)
+                if status >= 400:
+                    local_errors.append(status)
+        if count == 0:
+            barrier.wait()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_statuses': sorted(set(errors)),
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else None,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+        'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'max_ms': latencies[-1] * 1000 if latencies else None,
+    }
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_gunicorn(workers, threads):
+    """Start gunicorn on the seeded database and wait until it accepts connections"""
+    port = free_port()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--threads', str(threads), '--log-level', 'warning'],
+        cwd=root, env=dict(os.environ, WEB_CONCURRENCY=str(workers)))
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("gunicorn exited during startup (is it installed?)")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("gunicorn did not start within 60s")
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=list(ROUTES))
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--assessments', type=int, default=30, help="Assessments seeded per user")
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per route")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=1, help="Unmeasured requests per client first")
+    parser.add_argument('--http', action='store_true', help="Send real HTTP to a local gunicorn")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers with --http")
+    parser.add_argument('--threads', type=int, default=4, help="gunicorn threads per worker with --http")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--keep', action='store_true', help="Keep the seeded database directory")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='load-test-')
+    database = os.path.join(workdir, 'load_test.db')
+    # Must be set before the app (and its config) is imported
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    stubbed_pdf = stub_wkhtmltopdf(workdir)
+
+    started = time.perf_counter()
+    seed(args.users, args.assessments)
+    print(f"Seeded {args.users} users x {args.assessments} assessments in {time.perf_counter() - started:.1f}s "
+          f"({database})")
+    if stubbed_pdf:
+        print("wkhtmltopdf not found; using a stub that returns a fixed PDF")
+
+    server = None
+    try:
+        if args.http:
+            server, base_url = start_gunicorn(args.workers, args.threads)
+            new_session = lambda: HTTPSession(base_url)
+        else:
+            from app import app
+            new_session = lambda: TestClientSession(app)
+
+        results = {}
+        print(f"{'route':<20}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for route in args.routes:
+            stats = run_route(route, new_session, args.users, args.concurrency, args.requests, args.warmup)
+            results[route] = stats
+            print(f"{route:<20}{stats['requests_per_sec'] or 0:>9.1f}{stats['p50_ms'] or 0:>9.1f}"
+                  f"{stats['p95_ms'] or 0:>9.1f}{stats['p99_ms'] or 0:>9.1f}{stats['errors']:>8}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'mode': 'http' if args.http else 'test_client',
+            'stub_wkhtmltopdf': stubbed_pdf,
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'keep')},
+            'routes': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Login throughput for different password hashing settings.
+
+Verifies a stored hash repeatedly through PasswordHasher, first one at a time
+(latency) and then from as many client threads as the pool has workers
+(throughput), and reports logins/sec overall and per worker thread (not per
+core: ``--workers`` may exceed the cores available). Use it to pick a
+PASSWORD_HASH_METHOD that keeps a login under your latency budget. Run from
+the repository root:
+
+    python -m benchmarks.passwords --seconds 3
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passwords import PasswordHasher
+
+METHODS = (
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+)
+
+def run(hasher, pwhash, seconds, clients):
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        done = 0
+        while time.perf_counter() < deadline:
+            hasher.verify(pwhash, 'correct horse battery staple')
+            done += 1
+        return done
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        total = sum(pool.map(lambda _: client(), range(clients)))
+    return total / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--methods', nargs='+', default=METHODS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'method':<24}{'ms/login':>10}{'logins/s':>10}{'per worker':>12}")
+    for method in args.methods:
+        hasher = PasswordHasher(method, workers=args.workers)
+        pwhash = hasher.hash('correct horse battery staple')
+        single = run(hasher, pwhash, args.seconds / 3, 1)
+        parallel = run(hasher, pwhash, args.seconds, args.workers)
+        print(f"{method:<24}{1000 / single:>10.1f}{parallel:>10.1f}{parallel / args.workers:>12.1f}")
+
+if __name__ == '__main__':
+    main()
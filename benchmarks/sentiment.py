@@ -0,0 +1,64 @@
+"""Compare the keyword loop analyze_sentiment used to run with LexiconScorer.
+
+Run from the repository root:
+
+    python -m benchmarks.sentiment
+"""
+import argparse
+import random
+import string
+import timeit
+
+from sentiment import LexiconScorer
+
+def legacy_score(text, positive_words, negative_words):
+    """The original per-word substring scan, kept here as the baseline"""
+    text = text.lower()
+    neg_count = sum(1 for word in negative_words if word in text)
+    pos_count = sum(1 for word in positive_words if word in text)
+    return pos_count, neg_count, len(text.split())
+
+def make_words(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    return list(words)
+
+def make_text(rng, vocabulary, size):
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lexicon-sizes', type=int, nargs='+', default=[10, 1000, 10000, 50000])
+    parser.add_argument('--text-sizes', type=int, nargs='+', default=[200, 1024, 8192])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_words(rng, max(args.lexicon_sizes) + 2000)
+
+    print(f"{'lexicon':>8}{'text B':>8}{'legacy ms':>12}{'compiled ms':>13}{'speedup':>9}")
+    for lexicon_size in args.lexicon_sizes:
+        lexicon = vocabulary[:lexicon_size]
+        positive, negative = lexicon[::2], lexicon[1::2]
+        started = timeit.default_timer()
+        scorer = LexiconScorer.from_lists(positive, negative)
+        compile_ms = (timeit.default_timer() - started) * 1000
+        for text_size in args.text_sizes:
+            text = make_text(rng, vocabulary, text_size)
+            number = max(1, 2000 // lexicon_size)
+            legacy = min(timeit.repeat(lambda: legacy_score(text, positive, negative),
+                                       number=number, repeat=args.repeat)) / number * 1000
+            compiled = min(timeit.repeat(lambda: scorer.score(text),
+                                         number=number, repeat=args.repeat)) / number * 1000
+            print(f"{lexicon_size:>8}{text_size:>8}{legacy:>12.3f}{compiled:>13.3f}{legacy / compiled:>8.1f}x")
+        print(f"{'':>8}lexicon compile: {compile_ms:.1f} ms")
+
+if __name__ == '__main__':
+    main()
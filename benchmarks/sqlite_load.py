@@ -0,0 +1,104 @@
+"""Concurrent read/write throughput on SQLite with and without database.py tuning.
+
+Starts reader and writer processes (like gunicorn workers) against a fresh
+database per mode and counts completed operations. Run from the repository
+root:
+
+    python -m benchmarks.sqlite_load --readers 4 --writers 2 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app import Assessment, HISTORY_COLUMNS, User, db
+from database import apply_sqlite_pragmas, engine_options
+
+def make_engine(path, tuned):
+    uri = f'sqlite:///{path}'
+    if not tuned:
+        # Stock settings: rollback journal, FULL sync, 5 s sqlite3 timeout
+        return create_engine(uri)
+    engine = create_engine(uri, **engine_options(uri))
+    apply_sqlite_pragmas(engine)
+    return engine
+
+def seed(path, users, rows):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine, tables=[User.__table__, Assessment.__table__])
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'gender': 'female'}
+            for i in range(1, users + 1)])
+        conn.execute(insert(Assessment.__table__), [
+            {'user_id': rng.randint(1, users), 'date': start + timedelta(hours=i),
+             'phq9_score': rng.uniform(0, 10), 'depression_severity': 'Moderate'}
+            for i in range(rows)])
+    engine.dispose()
+
+def worker(role, path, tuned, users, deadline, results):
+    engine = make_engine(path, tuned)
+    rng = random.Random(os.getpid())
+    done = errors = 0
+    while time.time() < deadline:
+        user_id = rng.randint(1, users)
+        try:
+            with engine.begin() as conn:
+                if role == 'read':
+                    conn.execute(select(*HISTORY_COLUMNS).where(Assessment.user_id == user_id)
+                                 .order_by(Assessment.date)).all()
+                else:
+                    conn.execute(insert(Assessment.__table__).values(
+                        user_id=user_id, date=datetime.utcnow(), phq9_score=rng.uniform(0, 10),
+                        depression_severity='Mild'))
+            done += 1
+        except OperationalError:
+            errors += 1
+    engine.dispose()
+    results.put((role, done, errors))
+
+def run(tuned, args):
+    path = os.path.join(tempfile.mkdtemp(), 'load.db')
+    seed(path, args.users, args.rows)
+    results = multiprocessing.Queue()
+    deadline = time.time() + args.seconds
+    processes = [multiprocessing.Process(target=worker, args=(role, path, tuned, args.users, deadline, results))
+                 for role in ['read'] * args.readers + ['write'] * args.writers]
+    for process in processes:
+        process.start()
+    totals = {'read': [0, 0], 'write': [0, 0]}
+    for _ in processes:
+        role, done, errors = results.get()
+        totals[role][0] += done
+        totals[role][1] += errors
+    for process in processes:
+        process.join()
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per mode\n")
+    print(f"{'mode':<8}{'reads/s':>10}{'writes/s':>10}{'errors':>8}")
+    for tuned in (False, True):
+        totals = run(tuned, args)
+        errors = totals['read'][1] + totals['write'][1]
+        print(f"{'tuned' if tuned else 'stock':<8}{totals['read'][0] / args.seconds:>10.0f}"
+              f"{totals['write'][0] / args.seconds:>10.0f}{errors:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Per-route template render times with and without the fragment cache.
+
+Seeds a throwaway SQLite database (as benchmarks/load_test.py does), then
+requests each page through the Flask test client, first with the base.html
+fragment cache off and then on, and reports the median render_template time
+of each route's template from the app's own metrics, plus the time saved.
+Run from the repository root:
+
+    python -m benchmarks.templates
+    python -m benchmarks.templates --requests 500 --output templates.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+from datetime import datetime
+
+from benchmarks.load_test import PASSWORD, git_revision, seed
+
+# route -> (path, template, needs a logged-in session)
+PAGES = {
+    'index': ('/', 'index.html', False),
+    'login': ('/login', 'login.html', False),
+    'signup': ('/signup', 'signup.html', False),
+    'dashboard': ('/dashboard', 'dashboard.html', True),
+    'reports': ('/reports', 'reports.html', True),
+    'results': ('/results/1', 'results.html', True),
+    'assessment': ('/assessment', 'assessment.html', True),
+    'mindful_activities': ('/mindful_activities', 'mindful_activities.html', True),
+}
+
+def measure(app, metrics, route, requests):
+    """Return the p50 and mean render time (ms) of ``route``'s template over ``requests`` GETs"""
+    path, template, logged_in = PAGES[route]
+    client = app.test_client()
+    if logged_in:
+        client.post('/login', data={'email': 'user1@example.com', 'password': PASSWORD})
+    client.get(path).close()  # warm the template and fragment caches
+    metrics.reset()
+    for _ in range(requests):
+        response = client.get(path)
+        response.close()
+        if response.status_code != 200:
+            raise SystemExit(f"GET {path} returned {response.status_code}")
+    span = metrics.snapshot()['spans'][f'render_template[{template}]']
+    return {'p50_ms': span['p50'] * 1000, 'mean_ms': span['sum'] / span['count'] * 1000}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', nargs='+', choices=PAGES, default=list(PAGES))
+    parser.add_argument('--assessments', type=int, default=50, help="Assessments seeded for the user")
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per route and mode")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='templates-')
+    # Must be set before the app (and its config) is imported
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(workdir, "templates.db")}'
+    try:
+        seed(1, args.assessments)
+        from app import app, fragment_cache
+        from metrics import metrics
+
+        results = {}
+        print(f"{'route':<20}{'uncached ms':>13}{'cached ms':>11}{'saved ms':>10}{'saved':>8}")
+        for route in args.routes:
+            app.jinja_env.fragment_cache = None
+            uncached = measure(app, metrics, route, args.requests)
+            fragment_cache.clear()
+            app.jinja_env.fragment_cache = fragment_cache
+            cached = measure(app, metrics, route, args.requests)
+            saved = uncached['p50_ms'] - cached['p50_ms']
+            results[route] = {'uncached': uncached, 'cached': cached, 'saved_p50_ms': saved}
+            print(f"{route:<20}{uncached['p50_ms']:>13.3f}{cached['p50_ms']:>11.3f}{saved:>10.3f}"
+                  f"{saved / uncached['p50_ms']:>8.0%}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'settings': {'assessments': args.assessments, 'requests': args.requests},
+                'routes': results,
+            }, f, indent=2)
+        print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Micro-benchmarks for DepressionPredictor and the assessment scoring helpers.
+
+pytest-benchmark tests, skipped unless selected with the ``micro`` marker.
+Besides the timings, each test records the peak memory allocated during a
+call and what each call leaves allocated (from tracemalloc) in the
+benchmark's ``extra_info``. The models are synthetic and built once per
+session in a temporary directory (a small sklearn SVC and scaler, a hashing
+text encoder and a tiny Keras LSTM), so nothing from models/ is needed and
+no network access happens. Keras cases are skipped when TensorFlow is not
+installed. Run from the repository root:
+
+    python -m pytest benchmarks -m micro
+    python -m pytest benchmarks -m micro -k "svm or lstm" --benchmark-json micro.json
+"""
+import os
+import pickle
+import random
+import tracemalloc
+import warnings
+import zlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytestmark = pytest.mark.micro
+
+VOCAB_SIZE = 1000
+MAXLEN = 50
+
+TEXTS = [
+    'I feel hopeless and tired most days and nothing seems to help',
+    'Things are getting better, I went for a walk with a friend',
+    'Not sad exactly, just numb and worn out after work',
+]
+
+class HashingEncoder:
+    """Stand-in for the trained text encoder: hashed tokens, pre-padded to MAXLEN"""
+
+    def __init__(self, vocab_size=VOCAB_SIZE, maxlen=MAXLEN):
+        self.vocab_size = vocab_size
+        self.maxlen = maxlen
+
+    def transform(self, texts):
+        encoded = np.zeros((len(texts), self.maxlen), dtype=np.int32)
+        for row, text in enumerate(texts):
+            tokens = [zlib.crc32(word.encode('utf8')) % (self.vocab_size - 1) + 1
+                      for word in text.lower().split()][-self.maxlen:]
+            if tokens:
+                encoded[row, -len(tokens):] = tokens
+        return encoded
+
+def build_models(directory, keras=True):
+    """Write a synthetic scaler, SVC, encoder and (optionally) Keras LSTM into ``directory``"""
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    rng = np.random.default_rng(0)
+    features = rng.random((300, 5)) * [27, 1, 1, 1, 60] + [0, 0, 0, 0, 18]
+    features[:, 1:4] = features[:, 1:4].round()
+    labels = (features[:, 0] + 3 * features[:, 2] > 15).astype(int)
+    scaler = StandardScaler().fit(features)
+    with warnings.catch_warnings():
+        # Newer scikit-learn deprecates probability=True, which the app relies on
+        warnings.simplefilter('ignore', FutureWarning)
+        svm = SVC(probability=True, random_state=0).fit(scaler.transform(features), labels)
+    for name, artifact in (('scaler.pkl', scaler), ('svm_model.pkl', svm), ('encoder.pkl', HashingEncoder())):
+        with open(os.path.join(directory, name), 'wb') as f:
+            pickle.dump(artifact, f)
+
+    if keras:
+        from tensorflow import keras as tf_keras
+
+        model = tf_keras.Sequential([
+            tf_keras.layers.Input((MAXLEN,)),
+            tf_keras.layers.Embedding(VOCAB_SIZE, 16, mask_zero=True),
+            tf_keras.layers.LSTM(16),
+            tf_keras.layers.Dense(1, activation='sigmoid'),
+        ])
+        model.save(os.path.join(directory, 'lstm_model.h5'))
+
+def allocations(func, calls=200):
+    """Return peak bytes allocated by ``calls`` calls and bytes kept per call"""
+    tracemalloc.start()
+    try:
+        func()  # let caches and lazy imports settle before counting
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(calls):
+            func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': peak - base, 'retained_bytes_per_op': (current - base) / calls}
+
+def has_keras():
+    try:
+        import tensorflow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+@pytest.fixture(scope='session')
+def cases(tmp_path_factory):
+    """Map each case name to a zero-argument callable"""
+    # The helpers live in app.py; keep its import from touching a real database
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    from app import (_build_recommendations, adjust_severity_by_sentiment, analyze_sentiment,
+                     generate_recommendations)
+    from features import FeaturePipeline
+    from ml_models import DepressionPredictor, extract_features_from_form
+    from sentiment import PolarityAnalyzer
+
+    keras = has_keras()
+    models_dir = str(tmp_path_factory.mktemp('models'))
+    empty_dir = str(tmp_path_factory.mktemp('empty'))
+    build_models(models_dir, keras)
+
+    rng = random.Random(0)
+    form = {f'q{i}': str(rng.randint(0, 3)) for i in range(1, 10)}
+    form.update(age='34', work_interference='often', family_history='true', self_employed='false')
+    features = extract_features_from_form(form)
+    text = TEXTS[0]
+
+    # cache=False so every call does the work instead of hitting the prediction cache
+    model = DepressionPredictor(models_dir, eager=True, cache=False, lstm_backend='numpy' if keras else 'keras')
+    fallback = DepressionPredictor(empty_dir, cache=False)
+    # maxsize=0 keeps nothing, so every call scores the text
+    unmemoized = DepressionPredictor(empty_dir, cache=False, polarity=PolarityAnalyzer(maxsize=0))
+    pipeline = FeaturePipeline()
+
+    cases = {
+        'predict_depression_svm[model]': lambda: model.predict_depression_svm(features),
+        'predict_depression_svm[rule-based]': lambda: fallback.predict_depression_svm(features),
+        'predict_depression_svm_batch[model,100]': lambda: model.predict_depression_svm_batch([features] * 100),
+        'predict_depression_lstm[textblob]': lambda: fallback.predict_depression_lstm(text),
+        'predict_depression_lstm[textblob,unmemoized]': lambda: unmemoized.predict_depression_lstm(text),
+        'get_ensemble_prediction[fallback]': lambda: fallback.get_ensemble_prediction(features, text),
+        'analyze_sentiment': lambda: analyze_sentiment(text),
+        'adjust_severity_by_sentiment': lambda: adjust_severity_by_sentiment('Moderate', 'Negative'),
+        'generate_recommendations': lambda: generate_recommendations('Moderate', 'Working Women', 34),
+        'generate_recommendations[uncached]': lambda: _build_recommendations('Moderate', 'working_women'),
+        'extract_features_from_form': lambda: extract_features_from_form(form),
+        'FeaturePipeline.transform[form]': lambda: pipeline.transform(form),
+    }
+    if keras:
+        keras_model = DepressionPredictor(models_dir, eager=True, cache=False, lstm_backend='keras')
+        cases.update({
+            'predict_depression_lstm[keras]': lambda: keras_model.predict_depression_lstm(text),
+            'get_ensemble_prediction[keras]': lambda: keras_model.get_ensemble_prediction(features, text),
+            # The NumPy LSTM reads its weights from the same .h5 file
+            'predict_depression_lstm[numpy]': lambda: model.predict_depression_lstm(text),
+            'get_ensemble_prediction[numpy]': lambda: model.get_ensemble_prediction(features, text),
+        })
+    return cases
+
+CASES = [
+    'predict_depression_svm[model]',
+    'predict_depression_svm[rule-based]',
+    'predict_depression_svm_batch[model,100]',
+    'predict_depression_lstm[keras]',
+    'get_ensemble_prediction[keras]',
+    'predict_depression_lstm[numpy]',
+    'get_ensemble_prediction[numpy]',
+    'predict_depression_lstm[textblob]',
+    'predict_depression_lstm[textblob,unmemoized]',
+    'get_ensemble_prediction[fallback]',
+    'analyze_sentiment',
+    'adjust_severity_by_sentiment',
+    'generate_recommendations',
+    'generate_recommendations[uncached]',
+    'extract_features_from_form',
+    'FeaturePipeline.transform[form]',
+]
+
+@pytest.mark.parametrize('name', CASES)
+def test_micro(benchmark, cases, name):
+    if name not in cases:
+        pytest.skip("TensorFlow not installed")
+    func = cases[name]
+    benchmark.extra_info.update(allocations(func))
+    benchmark(func)
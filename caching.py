@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def hit_stats(hits, misses, **extra):
+    """Stats dict with ``hits``, ``misses`` and ``hit_rate`` plus any ``extra`` fields"""
+    lookups = hits + misses
+    return dict(extra, hits=hits, misses=misses, hit_rate=hits / lookups if lookups else 0.0)
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache with an optional time-to-live.
+
+    Tracks hits, misses, evictions (dropped for space) and expirations
+    (dropped for age) so callers can report hit rates.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return hit_stats(self.hits, self.misses, size=len(self._data), maxsize=self.maxsize,
+                         evictions=self.evictions, expirations=self.expirations)
+
+class SQLiteCache:
+    """JSON-valued cache in a SQLite file, shared by processes and kept across restarts"""
+
+    PURGE_EVERY = 256
+
+    def __init__(self, path, ttl=None, max_entries=100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._writes = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                         '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL, stored REAL NOT NULL)')
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads (or forks)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, default=None):
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        value, expires = row
+        if expires is not None and expires < time.time():
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO cache (key, value, expires, stored) VALUES (?, ?, ?, ?)',
+                         (key, json.dumps(value), expires, now))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge()
+
+    def delete(self, key):
+        with self._connection() as conn:
+            return conn.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount > 0
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache')
+
+    def purge(self):
+        """Drop expired rows, then the oldest rows beyond ``max_entries``"""
+        with self._connection() as conn:
+            self.expirations += conn.execute(
+                'DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?', (time.time(),)).rowcount
+            self.evictions += conn.execute(
+                'DELETE FROM cache WHERE key IN '
+                '(SELECT key FROM cache ORDER BY stored DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)).rowcount
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def stats(self):
+        return hit_stats(self.hits, self.misses, size=len(self), maxsize=self.max_entries,
+                         evictions=self.evictions, expirations=self.expirations)
@@ -0,0 +1,129 @@
+import hashlib
+import io
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from caching import LRUCache, hit_stats
+
+SEVERITY_COLORS = {
+    'Mild': 'green',
+    'Moderate': 'orange',
+    'Severe': 'red'
+}
+DEFAULT_COLOR = 'blue'
+
+# Built once and shared: Line2D handles are only read when the legend is drawn
+LEGEND_HANDLES = (
+    Line2D([0], [0], marker='o', color='w', markerfacecolor='green', label='Mild (0-3)', markersize=10),
+    Line2D([0], [0], marker='o', color='w', markerfacecolor='orange', label='Moderate (4-7)', markersize=10),
+    Line2D([0], [0], marker='o', color='w', markerfacecolor='red', label='Severe (8-10)', markersize=10)
+)
+
+# Severity thresholds drawn as dashed horizontal lines: (y, color)
+THRESHOLDS = ((3, 'lightgreen'), (7, 'orange'))
+
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+def render_progress_chart(dates, scores, severities, fmt='png'):
+    """Render the depression score progress chart as PNG or SVG bytes.
+
+    Uses a private Figure and Agg canvas rather than the pyplot state
+    machine, so concurrent requests in a threaded worker never share a
+    figure.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported chart format: {fmt}")
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    positions = np.arange(len(scores))
+    scores = np.asarray(scores, dtype=float)
+    colors = [SEVERITY_COLORS.get(severity, DEFAULT_COLOR) for severity in severities]
+
+    ax.plot(positions, scores, marker='o', linestyle='-', linewidth=2, markersize=8)
+    # One scatter call colors every point by severity (markersize 10 ~ s=100)
+    ax.scatter(positions, scores, c=colors, s=100, zorder=3)
+
+    # Customize the graph
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_title('Depression Score Progress', fontsize=14, pad=20)
+    ax.set_xlabel('Assessment Date', fontsize=12)
+    ax.set_ylabel('Depression Score (0-10)', fontsize=12)
+
+    # Set y-axis range to 0-10
+    ax.set_ylim(0, 10)
+
+    # Dates as categorical tick labels, rotated for better readability
+    ax.set_xticks(positions)
+    ax.set_xticklabels(dates, rotation=45)
+
+    # Add score labels on points
+    for position, score in zip(positions, scores):
+        ax.annotate(f'{score:.1f}', (position, score), textcoords="offset points", xytext=(0,10), ha='center')
+
+    # Add horizontal lines for severity thresholds
+    for y, color in THRESHOLDS:
+        ax.axhline(y=y, color=color, linestyle='--', alpha=0.5)
+
+    ax.legend(handles=LEGEND_HANDLES, title='Depression Severity', loc='center left', bbox_to_anchor=(1, 0.5))
+
+    # Adjust layout to prevent label cutoff
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, bbox_inches='tight')
+    return buf.getvalue()
+
+class RenderedChart:
+    """A rendered chart image plus the validators used for conditional GETs"""
+
+    def __init__(self, fingerprint, data, fmt, last_modified):
+        self.fingerprint = fingerprint
+        self.data = data
+        self.fmt = fmt
+        self.mimetype = FORMATS[fmt]
+        self.last_modified = last_modified
+        self.etag = hashlib.sha1(f"{fingerprint}:{fmt}".encode('utf8')).hexdigest()
+
+class ChartCache:
+    """Per-user cache of rendered progress charts.
+
+    Each user and format holds one entry, the latest chart rendered for it;
+    the chart carries its own fingerprint (assessment count plus latest
+    id/date), so evicting the entry drops both. A chart whose fingerprint
+    no longer matches the caller's (e.g. left behind in another worker) is
+    a miss and gets re-rendered.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize=maxsize)
+        self.stale = 0
+
+    def get(self, user_id, fingerprint, fmt='png'):
+        chart = self._cache.get((user_id, fmt))
+        if chart is not None and chart.fingerprint != fingerprint:
+            self.stale += 1
+            return None
+        return chart
+
+    def put(self, user_id, chart):
+        self._cache.set((user_id, chart.fmt), chart)
+
+    def invalidate(self, user_id):
+        for fmt in FORMATS:
+            self._cache.delete((user_id, fmt))
+
+    def stats(self):
+        stats = self._cache.stats()
+        # Stale charts were found by the LRU but are not served
+        return hit_stats(stats['hits'] - self.stale, stats['misses'] + self.stale,
+                         size=stats['size'], maxsize=stats['maxsize'], evictions=stats['evictions'],
+                         expirations=stats['expirations'], stale=self.stale)
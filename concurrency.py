@@ -0,0 +1,45 @@
+import os
+import tempfile
+import threading
+
+class PerProcess:
+    """An object made lazily by ``factory`` and remade in each forked process.
+
+    Threads (and pools of them) do not survive fork, so anything that owns
+    one is created on first use in every gunicorn worker rather than shared
+    with the master it was forked from.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return this process's object, making it first if needed"""
+        with self._lock:
+            if self._value is None or self._pid != os.getpid():
+                self._value = self.factory()
+                self._pid = os.getpid()
+            return self._value
+
+    def pop(self):
+        """Forget the object; return it if this process made it, else None"""
+        with self._lock:
+            value, self._value = self._value, None
+            return value if self._pid == os.getpid() else None
+
+def atomic_write(path, data):
+    """Write ``data`` (str or bytes) to ``path`` so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, (bytes, bytearray)) else 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
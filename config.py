@@ -4,8 +4,8 @@ class Config:
     # Flask configuration
     SECRET_KEY = os.urandom(24)
     
-    # Database configuration
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///virtuwellness.db'
+    # Database configuration (engine tuning lives in database.py)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///wellness.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # ML Models configuration
@@ -15,6 +15,28 @@ class Config:
     PERMANENT_SESSION_LIFETIME = 1800  # 30 minutes
     SESSION_PROTECTION = 'strong'
     
+    # Password hashing (see passwords.py); changing the method rehashes on next login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or None
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 0)) or None
+    
+    # Per-process cache of logged-in users (see load_user in app.py)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+    
+    # Cache base.html's nav and footer per locale and login state (see fragments.py);
+    # turn off while editing templates
+    FRAGMENT_CACHE = os.environ.get('FRAGMENT_CACHE', '1') != '0'
+    LANGUAGES = ('en',)
+    
+    # Bearer token required by /metrics; without one the endpoint is off unless
+    # METRICS_PUBLIC=1 opens it (e.g. when only an internal network can reach it)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC') == '1'
+    
+    # Bearer token for exporting every user's assessments (unset: admin export is off)
+    EXPORT_ADMIN_TOKEN = os.environ.get('EXPORT_ADMIN_TOKEN')
+    
     # Security configuration
     WTF_CSRF_ENABLED = True
     WTF_CSRF_SECRET_KEY = os.urandom(24)
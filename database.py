@@ -0,0 +1,109 @@
+import sqlite3
+
+from flask import g, has_app_context
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
+from config import Config
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer; NORMAL sync is durable across app crashes in WAL mode.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,             # ms to wait on a locked database before failing
+    'mmap_size': 256 * 1024 * 1024,   # bytes of the file to memory-map for reads
+    'cache_size': -64000,             # negative = KiB, so ~64 MB page cache per connection
+    'temp_store': 'MEMORY',
+}
+
+def engine_options(uri):
+    """Pool settings for the backend named by ``uri``."""
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            # Each connection to :memory: is a separate database; share one
+            return {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        # SQLite connections are cheap and the file is the bottleneck, so keep
+        # enough of them for threaded workers without unbounded overflow
+        return {
+            'pool_size': 10,
+            'max_overflow': 10,
+            'pool_timeout': 30,
+            'connect_args': {'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000, 'check_same_thread': False},
+        }
+    return {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+    }
+
+def apply_sqlite_pragmas(engine, pragmas=None):
+    """Run the tuning pragmas on every connection ``engine`` opens (no-op for other backends)."""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+def current_pragmas(engine):
+    """Read back the effective pragma values from a live connection."""
+    if engine.dialect.name != 'sqlite':
+        return {}
+    with engine.connect() as conn:
+        return {name: conn.exec_driver_sql(f'PRAGMA {name}').scalar() for name in SQLITE_PRAGMAS}
+
+def insert_ignoring_conflicts(table, dialect):
+    """INSERT into ``table`` that skips rows violating a unique constraint instead of failing."""
+    if dialect.name == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect.name == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with('IGNORE', dialect='mysql')
+
+def count_queries(app, db, header='X-Query-Count'):
+    """Count statements per request in ``g.query_count``.
+
+    The count is also sent in a response header, but only while the app runs
+    in debug or testing mode: it tells clients about server internals.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def increment(conn, cursor, statement, parameters, context, executemany):
+        if has_app_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    @app.before_request
+    def reset_count():
+        # A request can reuse an app context that is already pushed (e.g. in tests)
+        g.query_count = 0
+
+    @app.after_request
+    def add_header(response):
+        if app.debug or app.testing:
+            response.headers[header] = str(g.get('query_count', 0))
+        return response
+
+def create_db(app):
+    """Configure the app's database URI and engine, and return its SQLAlchemy instance."""
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', Config.SQLALCHEMY_DATABASE_URI)
+    app.config.setdefault('SQLALCHEMY_TRACK_MODIFICATIONS', Config.SQLALCHEMY_TRACK_MODIFICATIONS)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+    db = SQLAlchemy(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine)
+    return db
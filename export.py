@@ -0,0 +1,120 @@
+"""Export assessments as CSV or NDJSON in constant memory.
+
+Rows are read with ``yield_per`` (a server-side cursor where the backend
+has one, SQLite's stepping cursor otherwise), encoded into ~64 KiB text
+chunks and optionally gzipped, so only one batch of rows and one chunk are
+held at a time however large the export. The web app streams the same
+chunks as a chunked response (/export/assessments and, with the
+EXPORT_ADMIN_TOKEN bearer token, /admin/export/assessments). From the
+command line:
+
+    python export.py --output assessments.csv
+    python export.py --format ndjson --user-id 42 --since 2024-01-01 --gzip --output user42.ndjson.gz
+    python export.py --severity Moderate Severe --until 2025-01-01 > severe.csv
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+import zlib
+from datetime import datetime
+
+from sqlalchemy.types import Date, DateTime
+
+FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+# Spreadsheet apps run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def csv_safe(value):
+    """Quote user text that a spreadsheet would otherwise evaluate as a formula"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def encode(rows, columns, fmt, date_columns=(), chunk_size=CHUNK_SIZE):
+    """Yield ``rows`` (tuples in ``columns`` order) as CSV or NDJSON text chunks.
+
+    Values at the ``date_columns`` indexes are written as ISO 8601 strings.
+    CSV text cells that would start a formula get a leading ``'``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        write = lambda row: writer.writerow([csv_safe(value) for value in row])
+    else:
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        write = lambda row: buffer.write(dumps(dict(zip(columns, row))) + '\n')
+
+    for row in rows:
+        if date_columns:
+            row = list(row)
+            for index in date_columns:
+                if row[index] is not None:
+                    row[index] = row[index].isoformat()
+        write(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_export(query, fmt, compress=False, batch_size=BATCH_SIZE):
+    """Yield the rows of an ORM column ``query`` as encoded (and optionally gzipped) bytes"""
+    descriptions = query.column_descriptions
+    columns = [description['name'] for description in descriptions]
+    date_columns = [index for index, description in enumerate(descriptions)
+                    if isinstance(description['type'], (Date, DateTime))]
+    chunks = (chunk.encode('utf8') for chunk in encode(query.yield_per(batch_size), columns, fmt, date_columns))
+    return gzip_chunks(chunks) if compress else chunks
+
+def main():
+    parser = argparse.ArgumentParser(description="Export assessments as CSV or NDJSON")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--output', help="File to write (default: stdout)")
+    parser.add_argument('--user-id', type=int, help="Only this user's assessments")
+    parser.add_argument('--since', type=datetime.fromisoformat, help="Only assessments on or after this ISO date/time")
+    parser.add_argument('--until', type=datetime.fromisoformat, help="Only assessments before this ISO date/time")
+    parser.add_argument('--severity', nargs='+', help="Only these depression severities")
+    parser.add_argument('--gzip', action='store_true', help="Gzip the output")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Rows fetched per round trip")
+    args = parser.parse_args()
+
+    from app import app, export_query
+
+    started = time.perf_counter()
+    written = 0
+    with app.app_context():
+        query = export_query(user_id=args.user_id, since=args.since, until=args.until,
+                             severities=args.severity)
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            for chunk in stream_export(query, args.format, args.gzip, args.batch_size):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if args.output:
+                out.close()
+    # stdout may be the export itself, so report on stderr
+    print(f"Wrote {written} bytes in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
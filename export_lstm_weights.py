@@ -0,0 +1,21 @@
+import argparse
+import os
+
+from ml_models import export_lstm_weights
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export lstm_model.h5 weights to memory-mappable .npy files")
+    parser.add_argument('--model', default=os.path.join(MODELS_DIR, 'lstm_model.h5'),
+                        help="Keras .h5 model to read")
+    parser.add_argument('--output', default=os.path.join(MODELS_DIR, 'lstm_weights'),
+                        help="Directory to write the .npy files and manifest.json to")
+    args = parser.parse_args()
+
+    count = export_lstm_weights(args.model, args.output)
+    print(f"Exported {count} weight arrays to {args.output}")
+
+if __name__ == '__main__':
+    main()
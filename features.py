@@ -0,0 +1,157 @@
+"""Columnar feature extraction shared by online prediction and batch scoring.
+
+``FeaturePipeline.transform`` turns one form (a dict), a list of dicts, a
+pandas DataFrame or a NumPy structured array into the SVM's feature matrix
+with one vectorized operation per column, so scoring thousands of rows does
+no per-row Python work.
+"""
+import math
+from collections.abc import Mapping
+
+import numpy as np
+
+# Column order of the matrix fed to the scaler and SVM
+FEATURE_NAMES = ('phq_score', 'work_interference', 'family_history', 'self_employed', 'age')
+PHQ_ITEMS = tuple(f'q{i}' for i in range(1, 10))
+TEXT_FIELDS = ('mood_description', 'daily_activities', 'thoughts_feelings')
+
+TRUE_VALUES = ('true', 'yes', 'on', '1')
+
+# Below this many rows, columns are converted value by value
+SMALL_BATCH = 16
+
+def map_unique(values, convert):
+    """Apply ``convert`` to each distinct string in ``values`` and scatter the results back.
+
+    Columns hold a handful of distinct values, so this does Python work per
+    distinct value rather than per row.
+    """
+    if len(values) <= SMALL_BATCH:
+        # Single forms: converting directly beats setting up the unique pass
+        return np.array([convert(str(value)) for value in values], dtype=float)
+    if hasattr(values, 'factorize'):
+        # pandas columns: hash-based factorize beats sorting strings
+        inverse, keys = values.factorize(use_na_sentinel=False)
+        keys = [str(key) for key in keys]
+    else:
+        keys, inverse = np.unique(np.asarray(values).astype(str), return_inverse=True)
+    return np.array([convert(key) for key in keys], dtype=float)[np.asarray(inverse).reshape(-1)]
+
+def parse_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+class LookupEncoder:
+    """Map category strings to numbers through a lookup table.
+
+    Matching is case-insensitive; anything not in ``table`` (including
+    None/NaN) encodes as ``default``.
+    """
+
+    def __init__(self, table, default=0.0):
+        self.table = {key.lower(): float(value) for key, value in table.items()}
+        self.default = default
+
+    def __call__(self, values):
+        return map_unique(values, self.encode)
+
+    def encode(self, value):
+        return self.table.get(str(value).lower(), self.default)
+
+class FeaturePipeline:
+    """Build SVM feature matrices from forms or tabular batches.
+
+    PHQ-9 totals come from a ``phq_score`` column where it has a value,
+    otherwise from the ``q1``..``q9`` answers summed as a matrix reduction.
+    Missing values are handled per row, so a row scores the same alone as
+    in any batch.
+    """
+
+    def __init__(self, default_age=25):
+        self.default_age = default_age
+        self.work_interference = LookupEncoder({'often': 1.0, 'always': 1.0})
+        self.flag = LookupEncoder({value: 1.0 for value in TRUE_VALUES})
+
+    def transform(self, data):
+        """Return an (n, 5) float matrix with columns in ``FEATURE_NAMES`` order"""
+        if isinstance(data, Mapping):
+            return np.array([self._record(data)])
+        column, size = self._columns(data)
+        matrix = np.empty((size, len(FEATURE_NAMES)), dtype=float)
+        matrix[:, 0] = self._phq_scores(column, size)
+        matrix[:, 1] = self._encode(column('work_interference'), self.work_interference, size)
+        matrix[:, 2] = self._encode(column('family_history'), self.flag, size)
+        matrix[:, 3] = self._encode(column('self_employed'), self.flag, size)
+        age = self._numeric(column('age'), size)
+        matrix[:, 4] = np.where(np.isnan(age), self.default_age, age)
+        return matrix
+
+    def _record(self, record):
+        """Feature row for one form, without the per-column array setup"""
+        phq_score = parse_float(str(record.get('phq_score')))
+        if math.isnan(phq_score):
+            answers = (parse_float(str(record.get(item))) for item in PHQ_ITEMS)
+            phq_score = sum(answer for answer in answers if not math.isnan(answer))
+        age = parse_float(str(record.get('age')))
+        return [
+            phq_score,
+            self.work_interference.encode(record.get('work_interference')),
+            self.flag.encode(record.get('family_history')),
+            self.flag.encode(record.get('self_employed')),
+            self.default_age if math.isnan(age) else age,
+        ]
+
+    def phq_scores(self, data):
+        """Return the PHQ-9 total of every row"""
+        return self._phq_scores(*self._columns(data))
+
+    def _phq_scores(self, column, size):
+        scores = column('phq_score')
+        scores = self._numeric(scores, size) if scores is not None else np.full(size, np.nan)
+        missing = np.isnan(scores)
+        if missing.any():
+            # Rows without a total fall back to summing their answers
+            answers = np.column_stack([self._numeric(column(item), size) for item in PHQ_ITEMS])
+            scores = np.where(missing, np.nan_to_num(answers).sum(axis=1), scores)
+        return scores
+
+    def texts(self, data, fields=TEXT_FIELDS):
+        """Return each row's free-text fields joined into one string, for the LSTM"""
+        column, size = self._columns(data)
+        parts = [column(field) for field in fields]
+        parts = [part for part in parts if part is not None]
+        return [' '.join(value for value in row if isinstance(value, str) and value)
+                for row in zip(*parts)] if parts else [''] * size
+
+    @staticmethod
+    def _columns(data):
+        """Return (column getter, row count); the getter gives None for absent columns"""
+        if isinstance(data, Mapping):
+            return (lambda name: [data[name]] if name in data else None), 1
+        if hasattr(data, 'columns'):
+            return (lambda name: data[name] if name in data.columns else None), len(data)
+        if isinstance(data, np.ndarray) and data.dtype.names:
+            return (lambda name: data[name] if name in data.dtype.names else None), len(data)
+        rows = list(data)
+        # A key counts as a column if any row has it; rows without it read None
+        keys = set().union(*rows)
+        return (lambda name: [row.get(name) for row in rows] if name in keys else None), len(rows)
+
+    @staticmethod
+    def _numeric(values, size):
+        if values is None:
+            return np.full(size, np.nan)
+        if not hasattr(values, 'dtype'):
+            values = np.asarray(values)
+        if getattr(values.dtype, 'kind', 'O') in 'biuf':
+            if hasattr(values, 'to_numpy'):
+                return values.to_numpy(dtype=float, na_value=np.nan)
+            return values.astype(float)
+        # Strings from forms, or objects with None for SQL NULLs
+        return map_unique(values, parse_float)
+
+    @staticmethod
+    def _encode(values, encoder, size):
+        return encoder(values) if values is not None else np.zeros(size)
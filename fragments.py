@@ -0,0 +1,39 @@
+"""Jinja ``{% cache %}`` tag for template fragments that vary by only a few keys.
+
+    {% cache 'nav', current_locale(), current_user.is_authenticated %}
+        ...
+    {% endcache %}
+
+The fragment is rendered once per distinct tuple of tag arguments and then
+served from ``environment.fragment_cache`` (anything with get/set, e.g. an
+LRUCache), so everything the body depends on must be among the arguments.
+With no cache set the body renders every time.
+"""
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            key.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [nodes.List(key)]), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, caller):
+        cache = self.environment.fragment_cache
+        if cache is None:
+            return caller()
+        key = tuple(key)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = caller()
+            cache.set(key, fragment)
+        return fragment
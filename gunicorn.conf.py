@@ -0,0 +1,38 @@
+import gc
+import os
+
+# Set PRELOAD_MODELS=1 to import the app and load the ML models once in the
+# master process. Workers are forked afterwards and share those pages
+# copy-on-write instead of each loading a private copy.
+preload_models = os.environ.get('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+preload_app = preload_models
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+def post_worker_init(worker):
+    # Models stay lazy in each worker (TensorFlow is only imported on first
+    # use), but when the LSTM files are missing the TextBlob fallback is
+    # loaded here so no request pays for it
+    if preload_models:
+        return
+    from ml_models import get_predictor
+
+    predictor = get_predictor()
+    if predictor.uses_fallback_lstm():
+        seconds = predictor.polarity.warm_up()
+        worker.log.info("Loaded TextBlob fallback in worker %s in %.2fs", worker.pid, seconds)
+
+def when_ready(server):
+    if not preload_models:
+        return
+    from ml_models import ModelRegistry, warm_up_models
+
+    names = ModelRegistry.preload_names(os.environ.get('LSTM_BACKEND', 'keras'))
+    load_times = warm_up_models(list(names))
+    server.log.info("Preloaded models before fork: %s",
+                    ", ".join(f"{name} {seconds:.2f}s" for name, seconds in load_times.items()) or "none found")
+
+    # Move everything allocated so far into the permanent generation so the
+    # cyclic GC never writes to (and thereby un-shares) the model pages.
+    gc.collect()
+    gc.freeze()
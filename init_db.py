@@ -1,4 +1,5 @@
 from app import app, db
+from database import current_pragmas
 from models import User, Assessment
 
 def init_db():
@@ -10,6 +11,8 @@ def init_db():
         db.create_all()
         
         print("Database initialized successfully!")
+        for name, value in current_pragmas(db.engine).items():
+            print(f"  {name} = {value}")
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,199 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+ACTIVATIONS = {
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'softmax': _softmax,
+    'linear': lambda x: x,
+    None: lambda x: x,
+}
+
+# Layers that do nothing at inference time
+PASSTHROUGH_LAYERS = ('InputLayer', 'Dropout', 'SpatialDropout1D')
+
+# export_lstm_weights saves embeddings @ kernel per token when the table stays
+# below this many floats
+MAX_INPUT_TABLE_SIZE = 8 * 1024 * 1024
+
+def _activation(config, key, default):
+    name = config.get(key, default)
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return ACTIVATIONS[name]
+
+def _weights(layer):
+    return {weight['name']: np.asarray(weight['array'], dtype=np.float32) for weight in layer['weights']}
+
+class NumpyLSTM:
+    """Embedding -> LSTM -> Dense forward pass in plain NumPy.
+
+    Mirrors the Keras ``predict`` output for the model saved in
+    ``lstm_model.h5`` so CPU-only boxes can serve it without TensorFlow.
+    Input is the padded integer matrix produced by the encoder; each time
+    step is one matrix product over the whole batch. An ``input_table``
+    (see ``build_input_table``) turns the input projection into a row lookup.
+    """
+
+    def __init__(self, embeddings, kernel, recurrent_kernel, bias, dense_layers,
+                 activation=np.tanh, recurrent_activation=_sigmoid, mask_zero=False,
+                 go_backwards=False, input_table=None):
+        self.embeddings = embeddings
+        self.kernel = kernel
+        self.recurrent_kernel = recurrent_kernel
+        self.bias = bias
+        self.units = recurrent_kernel.shape[0]
+        self.dense_layers = dense_layers
+        self.activation = activation
+        self.recurrent_activation = recurrent_activation
+        self.mask_zero = mask_zero
+        self.go_backwards = go_backwards
+        self.input_table = input_table
+
+    @classmethod
+    def from_layers(cls, layers, input_table=None):
+        """Build the engine from a layer list (see ``ml_models.load_lstm_weights``)"""
+        embedding = lstm = None
+        dense_layers = []
+        for layer in layers:
+            class_name = layer['class_name']
+            if class_name in PASSTHROUGH_LAYERS or not layer['weights']:
+                continue
+            config = layer.get('config', {})
+            weights = _weights(layer)
+            if class_name == 'Embedding' and embedding is None:
+                embedding = (weights['embeddings'], config)
+            elif class_name == 'LSTM' and lstm is None and embedding is not None:
+                if config.get('return_sequences'):
+                    raise ValueError("LSTM layers returning sequences are not supported")
+                lstm = (weights, config)
+            elif class_name == 'Dense' and lstm is not None:
+                dense_layers.append((weights['kernel'], weights.get('bias'),
+                                     _activation(config, 'activation', 'linear')))
+            else:
+                raise ValueError(f"Unsupported layer for NumPy LSTM: {class_name} ({layer['name']})")
+
+        if embedding is None or lstm is None or not dense_layers:
+            raise ValueError("Expected an Embedding -> LSTM -> Dense model")
+
+        embeddings, embedding_config = embedding
+        lstm_weights, lstm_config = lstm
+        return cls(
+            embeddings,
+            lstm_weights['kernel'],
+            lstm_weights['recurrent_kernel'],
+            lstm_weights.get('bias', np.zeros(lstm_weights['kernel'].shape[1], dtype=np.float32)),
+            dense_layers,
+            activation=_activation(lstm_config, 'activation', 'tanh'),
+            recurrent_activation=_activation(lstm_config, 'recurrent_activation', 'sigmoid'),
+            mask_zero=bool(embedding_config.get('mask_zero')),
+            go_backwards=bool(lstm_config.get('go_backwards')),
+            input_table=input_table,
+        )
+
+    def build_input_table(self):
+        """Project every vocabulary entry through the input kernel, or None if too large"""
+        if self.embeddings.shape[0] * self.kernel.shape[1] > MAX_INPUT_TABLE_SIZE:
+            return None
+        return self.embeddings @ self.kernel + self.bias
+
+    def _input_projection(self, sequences):
+        if self.input_table is not None:
+            return self.input_table[sequences]
+        return self.embeddings[sequences] @ self.kernel + self.bias
+
+    def predict(self, sequences):
+        """Return model outputs for a (batch, timesteps) array of token ids"""
+        sequences = np.asarray(sequences, dtype=np.int64)
+        if sequences.ndim == 1:
+            sequences = sequences.reshape(1, -1)
+        batch_size, timesteps = sequences.shape
+
+        projected = self._input_projection(sequences)  # (batch, timesteps, 4 * units)
+        h = np.zeros((batch_size, self.units), dtype=np.float32)
+        c = np.zeros((batch_size, self.units), dtype=np.float32)
+        u = self.units
+
+        steps = range(timesteps - 1, -1, -1) if self.go_backwards else range(timesteps)
+        for t in steps:
+            z = projected[:, t] + h @ self.recurrent_kernel
+            # Keras gate order: input, forget, cell, output
+            i = self.recurrent_activation(z[:, :u])
+            f = self.recurrent_activation(z[:, u:2 * u])
+            g = self.activation(z[:, 2 * u:3 * u])
+            o = self.recurrent_activation(z[:, 3 * u:])
+            new_c = f * c + i * g
+            new_h = o * self.activation(new_c)
+            if self.mask_zero:
+                # Masked (padding) steps carry the previous state forward
+                keep = (sequences[:, t] != 0)[:, None]
+                new_c = np.where(keep, new_c, c)
+                new_h = np.where(keep, new_h, h)
+            h, c = new_h, new_c
+
+        output = h
+        for kernel, bias, activation in self.dense_layers:
+            output = output @ kernel
+            if bias is not None:
+                output = output + bias
+            output = activation(output)
+        return output
+
+def check_parity(h5_path, samples=64, timesteps=None, tolerance=1e-4, seed=0):
+    """Compare NumPy and Keras outputs on random token sequences.
+
+    Returns the largest absolute difference; raises AssertionError when it
+    exceeds ``tolerance``. Needs TensorFlow and h5py.
+    """
+    from tensorflow.keras.models import load_model
+    from ml_models import read_h5_layers
+
+    keras_model = load_model(h5_path)
+    engine = NumpyLSTM.from_layers(read_h5_layers(h5_path))
+
+    if timesteps is None:
+        timesteps = keras_model.input_shape[1] or 50
+    rng = np.random.default_rng(seed)
+    sequences = rng.integers(0, engine.embeddings.shape[0], size=(samples, timesteps))
+    # Pre-pad some rows with zeros the way the encoder does for short texts
+    lengths = rng.integers(1, timesteps + 1, size=samples)
+    sequences[np.arange(timesteps)[None, :] < (timesteps - lengths)[:, None]] = 0
+
+    expected = keras_model.predict(sequences, verbose=0)
+    actual = engine.predict(sequences)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    assert max_diff <= tolerance, f"NumPy LSTM differs from Keras by {max_diff:.2e} (tolerance {tolerance:.0e})"
+    return max_diff
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the NumPy LSTM against Keras")
+    parser.add_argument('--model', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        'models', 'lstm_model.h5'))
+    parser.add_argument('--samples', type=int, default=64)
+    parser.add_argument('--tolerance', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    try:
+        max_diff = check_parity(args.model, samples=args.samples, tolerance=args.tolerance)
+    except AssertionError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ NumPy LSTM matches Keras (max abs difference {max_diff:.2e})")
+
+if __name__ == '__main__':
+    main()
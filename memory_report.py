@@ -0,0 +1,62 @@
+import argparse
+import os
+
+def read_memory(pid):
+    """Return RSS/PSS/shared/private memory in kB for a process (Linux only)"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+def child_pids(pid):
+    """Return the direct children of a process"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report RSS and PSS for a gunicorn master and its workers")
+    parser.add_argument('master_pid', type=int, help="PID of the gunicorn master process")
+    args = parser.parse_args()
+
+    rows = [('master', args.master_pid)] + [('worker', pid) for pid in child_pids(args.master_pid)]
+    totals = {'rss': 0, 'pss': 0, 'shared': 0, 'private': 0}
+
+    print(f"{'role':<8}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'shared MB':>11}{'private MB':>12}")
+    for role, pid in rows:
+        try:
+            memory = read_memory(pid)
+        except OSError as e:
+            print(f"{role:<8}{pid:>8}  unavailable: {e}")
+            continue
+        for key in totals:
+            totals[key] += memory[key]
+        print(f"{role:<8}{pid:>8}{memory['rss'] / 1024:>10.1f}{memory['pss'] / 1024:>10.1f}"
+              f"{memory['shared'] / 1024:>11.1f}{memory['private'] / 1024:>12.1f}")
+
+    print(f"{'total':<16}{totals['rss'] / 1024:>10.1f}{totals['pss'] / 1024:>10.1f}"
+          f"{totals['shared'] / 1024:>11.1f}{totals['private'] / 1024:>12.1f}")
+    print("\nPSS is the meaningful total: pages shared by N processes count 1/N towards each.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""In-process latency histograms, counters and cache stats in Prometheus text format.
+
+Everything is per process: behind gunicorn each worker keeps (and serves)
+its own numbers.
+"""
+import bisect
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds in seconds: 10 us to ~100 s, each 20% wider than the
+# last, so interpolated percentiles are within a few percent
+BUCKETS = tuple(1e-5 * 1.2 ** i for i in range(int(math.log(1e7) / math.log(1.2)) + 2))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram with interpolated percentiles"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def percentile(self, q):
+        """Estimate the ``q`` quantile (0-1) by interpolating within its bucket"""
+        with self._lock:
+            counts, total, largest = list(self.counts), self.count, self.max
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else largest
+                return min(lower + (upper - lower) * (rank - seen) / count, largest)
+            seen += count
+        return largest
+
+    def summary(self):
+        summary = {f'p{round(q * 100)}': self.percentile(q) for q in QUANTILES}
+        summary.update(count=self.count, sum=self.sum, max=self.max)
+        return summary
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class Metrics:
+    """Registry of span histograms, counters and cache stats callbacks"""
+
+    def __init__(self, prefix='wellness'):
+        self.prefix = prefix
+        self.histograms = {}
+        self.counters = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _labels(labels))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block into the ``name`` histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name):
+        """Decorator form of ``span``"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def register_cache(self, name, stats):
+        """Report ``stats()`` (a dict with hits and misses) under cache=``name``"""
+        self.caches[name] = stats
+
+    def reset(self):
+        """Drop all recorded spans and counters (registered caches stay)"""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def _copy(self):
+        with self._lock:
+            return sorted(self.histograms.items()), sorted(self.counters.items())
+
+    def snapshot(self):
+        """Plain-dict view of everything, for JSON output"""
+        histograms, counters = self._copy()
+        return {
+            'spans': {self._key(name, labels): histogram.summary() for (name, labels), histogram in histograms},
+            'counters': {self._key(name, labels): value for (name, labels), value in counters},
+            'caches': {name: self._cache_stats(stats) for name, stats in sorted(self.caches.items())},
+        }
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format"""
+        histograms, counters = self._copy()
+        lines = []
+        name = f'{self.prefix}_span_seconds'
+        lines += [f'# HELP {name} Time spent in instrumented code paths', f'# TYPE {name} summary']
+        for (span, labels), histogram in histograms:
+            labels = (('span', span),) + labels
+            for q in QUANTILES:
+                value = histogram.percentile(q)
+                lines.append(f'{name}{_format_labels(labels, quantile=q)} {value if value is not None else "NaN"}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+
+        for counter in sorted({counter for (counter, _), _ in counters}):
+            name = f'{self.prefix}_{counter}_total'
+            lines.append(f'# TYPE {name} counter')
+            for (other, labels), value in counters:
+                if other == counter:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        caches = {cache: self._cache_stats(stats) for cache, stats in sorted(self.caches.items())}
+        for field, kind in (('hits', 'counter'), ('misses', 'counter'), ('hit_rate', 'gauge')):
+            name = f'{self.prefix}_cache_{field}' + ('_total' if kind == 'counter' else '')
+            lines.append(f'# TYPE {name} {kind}')
+            for cache, stats in caches.items():
+                if stats and field in stats:
+                    lines.append(f'{name}{_format_labels((("cache", cache),))} {stats[field]}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _key(name, labels):
+        return name + ''.join(f'[{value}]' for _, value in labels)
+
+    @staticmethod
+    def _cache_stats(stats):
+        try:
+            return stats()
+        except Exception:
+            return None
+
+metrics = Metrics()
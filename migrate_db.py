@@ -0,0 +1,78 @@
+import argparse
+import hashlib
+
+from sqlalchemy import inspect, text
+
+from app import app, db, UserStats
+
+def add_assessment_history_index(conn):
+    """Composite (user_id, date) index used by every per-user history query"""
+    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_assessment_user_date ON assessment (user_id, date)'))
+
+def backfill_user_stats(conn):
+    """Fill user_stats for users with assessments but no stats row"""
+    from rebuild_stats import compute_stats
+
+    existing = set(conn.execute(text('SELECT user_id FROM user_stats')).scalars())
+    missing = [row for user_id, row in compute_stats(conn).items() if user_id not in existing]
+    if missing:
+        conn.execute(UserStats.__table__.insert(), missing)
+    print(f"  {len(missing)} users backfilled")
+
+def add_recommendation_reference(conn):
+    """Add assessment.recommendation_id pointing at interned recommendations"""
+    columns = [column['name'] for column in inspect(conn).get_columns('assessment')]
+    if 'recommendation_id' not in columns:
+        conn.execute(text('ALTER TABLE assessment ADD COLUMN recommendation_id INTEGER '
+                          'REFERENCES recommendation (id)'))
+
+def compact_recommendations(conn):
+    """Move per-row recommendations HTML into the recommendation table"""
+    distinct = conn.execute(text('SELECT DISTINCT recommendations FROM assessment '
+                                 'WHERE recommendations IS NOT NULL AND recommendation_id IS NULL')).scalars().all()
+    for html in distinct:
+        content_hash = hashlib.sha1(html.encode('utf8')).hexdigest()
+        recommendation_id = conn.execute(text('SELECT id FROM recommendation WHERE content_hash = :hash'),
+                                         {'hash': content_hash}).scalar()
+        if recommendation_id is None:
+            recommendation_id = conn.execute(text('INSERT INTO recommendation (content_hash, html) '
+                                                  'VALUES (:hash, :html)'),
+                                             {'hash': content_hash, 'html': html}).lastrowid
+        conn.execute(text('UPDATE assessment SET recommendation_id = :id, recommendations = NULL '
+                          'WHERE recommendations = :html AND recommendation_id IS NULL'),
+                     {'id': recommendation_id, 'html': html})
+    print(f"  {len(distinct)} distinct recommendation texts interned")
+
+# Applied in order; each step must be safe to run more than once
+MIGRATIONS = [
+    add_assessment_history_index,
+    backfill_user_stats,
+    add_recommendation_reference,
+    compact_recommendations,
+]
+
+def migrate(vacuum=False):
+    """Bring an existing database up to the current schema without dropping data"""
+    with app.app_context():
+        # Create any tables that do not exist yet
+        db.create_all()
+        with db.engine.begin() as conn:
+            for migration in MIGRATIONS:
+                print(f"Applying {migration.__name__}: {migration.__doc__}")
+                migration(conn)
+            conn.execute(text('ANALYZE'))
+        indexes = [index['name'] for index in inspect(db.engine).get_indexes('assessment')]
+        print(f"Assessment indexes: {', '.join(indexes) or 'none'}")
+        if vacuum and db.engine.dialect.name == 'sqlite':
+            # Reclaim the space freed by compaction; VACUUM cannot run inside a transaction
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text('VACUUM'))
+            print("Database file vacuumed")
+        print("Database migrated successfully!")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Apply schema migrations to the app database")
+    parser.add_argument('--vacuum', action='store_true',
+                        help="Run VACUUM afterwards to shrink the SQLite file")
+    args = parser.parse_args()
+    migrate(vacuum=args.vacuum)
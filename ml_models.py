@@ -1,16 +1,322 @@
 import numpy as np
 import pickle
-from tensorflow.keras.models import load_model
+import hashlib
+import json
 import os
-from textblob import TextBlob
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from caching import LRUCache, SQLiteCache
+from concurrency import PerProcess
+from features import FEATURE_NAMES, FeaturePipeline
+from metrics import metrics
+from sentiment import PolarityAnalyzer
+
+def _load_pickle(path, registry):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def load_lstm_weights(weights_dir, mmap_mode='r'):
+    """Open weights written by ``export_lstm_weights``.
+
+    Returns the manifest's layer list with each weight's array attached under
+    ``'array'``. Arrays are memory-mapped read-only by default, so every
+    process that opens them shares the same page-cache copy.
+    """
+    with open(os.path.join(weights_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    for layer in manifest['layers']:
+        for weight in layer['weights']:
+            weight['array'] = np.load(os.path.join(weights_dir, weight['file']), mmap_mode=mmap_mode)
+    return manifest['layers']
+
+def load_input_table(weights_dir, mmap_mode='r'):
+    """Open the LSTM input table saved by ``export_lstm_weights``, or return None"""
+    with open(os.path.join(weights_dir, 'manifest.json')) as f:
+        filename = json.load(f).get('input_table')
+    if filename is None:
+        return None
+    return np.load(os.path.join(weights_dir, filename), mmap_mode=mmap_mode)
+
+def _decode(value):
+    return value.decode('utf8') if isinstance(value, bytes) else value
+
+def read_h5_layers(h5_path):
+    """Read layer configs and weights from a Keras ``.h5`` model without TensorFlow.
+
+    Returns the same layer list shape as ``load_lstm_weights``, with the
+    arrays loaded into memory.
+    """
+    import h5py
+
+    with h5py.File(h5_path, 'r') as f:
+        model_config = _decode(f.attrs.get('model_config'))
+        layer_configs = {}
+        if model_config:
+            for layer in json.loads(model_config)['config']['layers']:
+                layer_configs[layer['config']['name']] = layer
+
+        weights_group = f['model_weights'] if 'model_weights' in f else f
+        layers = []
+        for layer_name in weights_group.attrs['layer_names']:
+            layer_name = _decode(layer_name)
+            group = weights_group[layer_name]
+            weights = []
+            for weight_name in group.attrs['weight_names']:
+                weight_name = _decode(weight_name)
+                weights.append({
+                    'name': weight_name.split('/')[-1].split(':')[0],
+                    'array': np.asarray(group[weight_name])
+                })
+            layer_config = layer_configs.get(layer_name, {})
+            layers.append({
+                'name': layer_name,
+                'class_name': layer_config.get('class_name'),
+                'config': layer_config.get('config', {}),
+                'weights': weights
+            })
+    return layers
+
+def export_lstm_weights(h5_path, weights_dir):
+    """Export the weights of a Keras ``.h5`` model to one ``.npy`` file per array.
+
+    Reads the HDF5 file with h5py directly, so TensorFlow is not required.
+    A ``manifest.json`` records layer order, class names, layer configs and
+    the file holding each weight. For a model the NumPy LSTM can serve, the
+    precomputed input table (``NumpyLSTM.build_input_table``) is saved too,
+    so workers memory-map it instead of each building a private copy.
+    Returns the number of weight arrays written.
+    """
+    from lstm_numpy import NumpyLSTM
+
+    os.makedirs(weights_dir, exist_ok=True)
+    layers = read_h5_layers(h5_path)
+    manifest = {'source': os.path.basename(h5_path), 'layers': layers}
+    try:
+        input_table = NumpyLSTM.from_layers(layers).build_input_table()
+    except ValueError:
+        input_table = None
+    if input_table is not None:
+        manifest['input_table'] = 'input_table.npy'
+        np.save(os.path.join(weights_dir, manifest['input_table']), input_table)
+
+    count = 0
+    for layer in layers:
+        for weight in layer['weights']:
+            weight['file'] = f"{count:02d}_{layer['name']}_{weight['name']}.npy"
+            np.save(os.path.join(weights_dir, weight['file']), weight.pop('array'))
+            count += 1
+
+    with open(os.path.join(weights_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return count
+
+def _load_lstm_weights(path, registry):
+    return load_lstm_weights(path)
+
+def _load_numpy_lstm(path, registry):
+    from lstm_numpy import NumpyLSTM
+
+    if os.path.isdir(path):
+        # Reuse the registry's memory maps (possibly opened before fork)
+        return NumpyLSTM.from_layers(registry.get('lstm_weights'), input_table=load_input_table(path))
+    return NumpyLSTM.from_layers(read_h5_layers(path))
+
+def _load_keras_model(path, registry):
+    # TensorFlow is imported here, not at module import, so processes that
+    # never touch the LSTM never pay for it.
+    from tensorflow.keras.models import load_model
+    return load_model(path)
+
+class ModelRegistry:
+    """Load model artifacts on first use and record how long each load took"""
+
+    # name -> (file name or candidate file names, label, loader(path, registry))
+    ARTIFACTS = {
+        'encoder': ('encoder.pkl', 'encoder', _load_pickle),
+        'scaler': ('scaler.pkl', 'scaler', _load_pickle),
+        'svm_model': ('svm_model.pkl', 'SVM model', _load_pickle),
+        'lstm_model': ('lstm_model.h5', 'LSTM model', _load_keras_model),
+        'lstm_weights': ('lstm_weights', 'LSTM weights', _load_lstm_weights),
+        'lstm_numpy': (('lstm_weights', 'lstm_model.h5'), 'NumPy LSTM', _load_numpy_lstm),
+    }
+
+    # Artifacts that are safe to load in a gunicorn master before fork.
+    # TensorFlow is left out: its thread pools do not survive fork.
+    PRELOAD = ('encoder', 'scaler', 'svm_model')
+
+    @classmethod
+    def preload_names(cls, lstm_backend):
+        """Artifacts to load before fork when serving with ``lstm_backend``"""
+        if lstm_backend == 'numpy':
+            # The NumPy LSTM is fork-safe and its weights stay shared memory maps
+            return cls.PRELOAD + ('lstm_weights', 'lstm_numpy')
+        return cls.PRELOAD
+
+    def __init__(self, models_path):
+        self.models_path = models_path
+        self.load_times = {}
+        self._models = {}
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        """Return the named artifact, loading it on first access (None if unavailable)"""
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def set(self, name, value):
+        """Install an artifact directly, e.g. an in-memory model"""
+        with self._lock:
+            self._models[name] = value
+
+    def fingerprint(self):
+        """Identify the model files on disk (name, size, mtime) so caches can tell versions apart"""
+        parts = []
+        for filenames, _, _ in self.ARTIFACTS.values():
+            for filename in (filenames,) if isinstance(filenames, str) else filenames:
+                path = os.path.join(self.models_path, filename)
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    parts.append(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}")
+        return hashlib.sha256('|'.join(parts).encode('utf8')).hexdigest()[:16]
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def available(self, name):
+        """Whether the artifact is (or could be) loaded, without loading it"""
+        if name in self._models:
+            return self._models[name] is not None
+        filenames = self.ARTIFACTS[name][0]
+        filenames = (filenames,) if isinstance(filenames, str) else filenames
+        return any(os.path.exists(os.path.join(self.models_path, filename)) for filename in filenames)
+
+    def warm_up(self, names=None):
+        """Load the given artifacts (all by default) and return their load times"""
+        for name in names or self.ARTIFACTS:
+            self.get(name)
+        return dict(self.load_times)
+
+    def _load(self, name):
+        filenames, label, loader = self.ARTIFACTS[name]
+        if isinstance(filenames, str):
+            filenames = (filenames,)
+        title = label[0].upper() + label[1:]
+        paths = [os.path.join(self.models_path, filename) for filename in filenames]
+        path = next((p for p in paths if os.path.exists(p)), None)
+        if path is None:
+            print(f"Loading {label} from: {paths[0]}")
+            print(f"✗ {title} file not found")
+            return None
+        print(f"Loading {label} from: {path}")
+        started = time.perf_counter()
+        try:
+            model = loader(path, self)
+        except Exception as e:
+            print(f"Warning: {title} not loaded: {str(e)}")
+            return None
+        self.load_times[name] = time.perf_counter() - started
+        print(f"✓ {title} loaded successfully in {self.load_times[name]:.2f}s")
+        return model
+
+def _registry_property(name):
+    def getter(self):
+        return self.registry.get(name)
+
+    def setter(self, value):
+        self.registry.set(name, value)
+
+    return property(getter, setter)
+
+class PredictionCache:
+    """Cache of per-model results keyed on a hash of their normalized inputs.
+
+    An in-process LRU/TTL cache sits in front of an optional SQLite store
+    that is shared between workers and survives restarts.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, shared_path=None, namespace=''):
+        self.namespace = namespace
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.shared = SQLiteCache(shared_path, ttl=ttl) if shared_path else None
+
+    @classmethod
+    def from_env(cls, namespace=''):
+        return cls(
+            maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 1024)),
+            ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+            shared_path=os.environ.get('PREDICTION_CACHE_PATH') or None,
+            namespace=namespace
+        )
+
+    @staticmethod
+    def normalize_text(text):
+        return ' '.join((text or '').lower().split())
+
+    def key(self, kind, value):
+        payload = json.dumps([self.namespace, kind, value], default=str)
+        return hashlib.sha256(payload.encode('utf8')).hexdigest()
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        # Hand out copies so callers cannot mutate cached entries
+        return dict(value) if value is not None else None
+
+    def set(self, key, value):
+        self.local.set(key, dict(value))
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self):
+        return {
+            'local': self.local.stats(),
+            'shared': self.shared.stats() if self.shared is not None else None
+        }
+
+LSTM_BACKENDS = ('keras', 'numpy')
+
+# TextBlob fallback for when the LSTM or encoder is missing, shared by all predictors
+polarity_analyzer = PolarityAnalyzer(maxsize=int(os.environ.get('POLARITY_CACHE_SIZE', 4096)))
+metrics.register_cache('polarity', polarity_analyzer.stats)
 
 class DepressionPredictor:
-    def __init__(self):
-        self.models_path = os.path.join(os.path.dirname(__file__), 'models')
-        self.svm_model = None
-        self.lstm_model = None
-        self.encoder = None
-        self.scaler = None
+    svm_model = _registry_property('svm_model')
+    lstm_model = _registry_property('lstm_model')
+    numpy_lstm = _registry_property('lstm_numpy')
+    encoder = _registry_property('encoder')
+    scaler = _registry_property('scaler')
+
+    def __init__(self, models_path=None, eager=False, lstm_backend=None, cache=None, pipeline=None,
+                 polarity=None):
+        self.models_path = models_path or os.path.join(os.path.dirname(__file__), 'models')
+        self.registry = ModelRegistry(self.models_path)
+        self.pipeline = pipeline or FeaturePipeline()
+        self.polarity = polarity or polarity_analyzer
+        # 'numpy' runs the LSTM forward pass without TensorFlow (see lstm_numpy.py)
+        self.lstm_backend = lstm_backend or os.environ.get('LSTM_BACKEND', 'keras')
+        if self.lstm_backend not in LSTM_BACKENDS:
+            raise ValueError(f"Unknown LSTM backend: {self.lstm_backend}")
+        # None builds the default cache from the environment; False disables caching
+        if cache is None:
+            cache = PredictionCache.from_env(
+                namespace=f"{self.lstm_backend}:{self.registry.fingerprint()}")
+        self.cache = cache or None
         print(f"\n{'='*50}\nInitializing ML Models\n{'='*50}")
         print(f"Models directory: {self.models_path}")
         print(f"Directory exists: {os.path.exists(self.models_path)}")
@@ -18,173 +324,352 @@ class DepressionPredictor:
             print("Contents of models directory:")
             for file in os.listdir(self.models_path):
                 print(f"- {file}")
-        self.load_models()
+        if eager:
+            self.load_models()
 
-    def load_models(self):
-        """Load the trained models and preprocessors"""
-        try:
-            print("\nAttempting to load models...")
-            
-            # Load encoder
-            encoder_path = os.path.join(self.models_path, 'encoder.pkl')
-            print(f"Loading encoder from: {encoder_path}")
-            if os.path.exists(encoder_path):
-                with open(encoder_path, 'rb') as f:
-                    self.encoder = pickle.load(f)
-                print("✓ Encoder loaded successfully")
-            else:
-                print("✗ Encoder file not found")
-            
-            # Load scaler
-            scaler_path = os.path.join(self.models_path, 'scaler.pkl')
-            print(f"Loading scaler from: {scaler_path}")
-            if os.path.exists(scaler_path):
-                with open(scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-                print("✓ Scaler loaded successfully")
-            else:
-                print("✗ Scaler file not found")
-            
-            # Load SVM model
-            svm_path = os.path.join(self.models_path, 'svm_model.pkl')
-            print(f"Loading SVM model from: {svm_path}")
-            if os.path.exists(svm_path):
-                with open(svm_path, 'rb') as f:
-                    self.svm_model = pickle.load(f)
-                print("✓ SVM model loaded successfully")
-            else:
-                print("✗ SVM model file not found")
-            
-            # Load LSTM model
-            lstm_path = os.path.join(self.models_path, 'lstm_model.h5')
-            print(f"Loading LSTM model from: {lstm_path}")
-            if os.path.exists(lstm_path):
-                self.lstm_model = load_model(lstm_path)
-                print("✓ LSTM model loaded successfully")
-            else:
-                print("✗ LSTM model file not found")
-            
-        except Exception as e:
-            print(f"Warning: ML models not loaded: {str(e)}")
-            self.svm_model = None
-            self.lstm_model = None
-            self.encoder = None
-            self.scaler = None
+    @metrics.timed('predictor.load_models')
+    def load_models(self, names=None):
+        """Load the trained models and preprocessors now instead of on first use"""
+        print("\nAttempting to load models...")
+        if names is None:
+            unused = 'lstm_model' if self.lstm_backend == 'numpy' else 'lstm_numpy'
+            names = [name for name in ModelRegistry.ARTIFACTS if name not in (unused, 'lstm_weights')]
+        load_times = self.registry.warm_up(names)
+        if self.uses_fallback_lstm():
+            # TextBlob serves the LSTM path, so load it now rather than in a request
+            load_times['textblob'] = self.polarity.warm_up()
+        if load_times:
+            print(f"Total model load time: {sum(load_times.values()):.2f}s")
+        return load_times
+
+    def uses_fallback_lstm(self):
+        """True when LSTM predictions will come from TextBlob (model or encoder missing)"""
+        lstm = 'lstm_numpy' if self.lstm_backend == 'numpy' else 'lstm_model'
+        return not self.registry.available(lstm) or not self.registry.available('encoder')
 
+    @metrics.timed('predictor.predict_depression_svm')
     def predict_depression_svm(self, features):
         """Make prediction using SVM model"""
+        return self.predict_depression_svm_batch(features)[0]
+
+    @metrics.timed('predictor.predict_depression_svm_batch')
+    def predict_depression_svm_batch(self, features_list):
+        """Make predictions for a batch with one scaler/SVM call.
+
+        Accepts anything ``FeaturePipeline.transform`` does: one form or
+        feature dict, a list of them, or a DataFrame.
+        """
+        matrix = self.pipeline.transform(features_list)
+        return self._cached_batch('svm', matrix, lambda row: row.tolist(), self._predict_svm_batch)
+
+    def _predict_svm_batch(self, rows):
+        feature_array = np.asarray(rows, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        # A non-finite row (e.g. age='inf') would make the scaler reject the
+        # whole batch, so it gets None on its own and the rest are scored
+        finite = np.isfinite(feature_array).all(axis=1)
+        results = [None] * len(feature_array)
+        if finite.any():
+            for i, result in zip(np.flatnonzero(finite), self._predict_svm_rows(feature_array[finite])):
+                results[i] = result
+        return results
+
+    def _predict_svm_rows(self, feature_array):
         try:
             if not self.svm_model or not self.scaler:
                 # If models aren't loaded, use a rule-based approach
-                phq_score = features.get('phq_score', 0)
-                work_interference = features.get('work_interference', 'never')
-                family_history = features.get('family_history', False)
-                
-                # Calculate base probability
-                base_prob = min(phq_score / 27.0, 1.0)  # Normalize PHQ-9 score
-                
-                # Adjust based on other factors
-                if work_interference in ['often', 'always']:
-                    base_prob += 0.1
-                if family_history:
-                    base_prob += 0.1
-                
-                return {
-                    'probability': min(base_prob, 1.0),
-                    'confidence': 0.7
-                }
-            
-            # Convert features to array format
-            feature_array = np.array([
-                features['phq_score'],
-                1 if features['work_interference'] in ['often', 'always'] else 0,
-                1 if features['family_history'] else 0,
-                1 if features['self_employed'] else 0,
-                features['age']
-            ]).reshape(1, -1)
-            
+                return self._rule_based_svm(feature_array)
+
             # Scale features
             scaled_features = self.scaler.transform(feature_array)
-            
-            # Get prediction
-            probability = self.svm_model.predict_proba(scaled_features)[0][1]
-            
-            return {
-                'probability': float(probability),
-                'confidence': 0.85
-            }
-            
+
+            # Get predictions for the whole batch
+            probabilities = self.svm_model.predict_proba(scaled_features)[:, 1]
+
+            return [
+                {
+                    'probability': float(probability),
+                    'confidence': 0.85
+                }
+                for probability in probabilities
+            ]
+
         except Exception as e:
+            if len(feature_array) > 1:
+                # Score one row at a time so only the failing row gets None
+                return [self._predict_svm_rows(feature_array[i:i + 1])[0] for i in range(len(feature_array))]
             print(f"Error in SVM prediction: {str(e)}")
-            return None
+            return [None]
+
+    def _cached_batch(self, kind, inputs, normalize, predict):
+        """Serve cached results and run ``predict`` once over the misses"""
+        if self.cache is None:
+            return predict(inputs)
+
+        keys = [self.cache.key(kind, normalize(item)) for item in inputs]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            computed = predict([inputs[i] for i in missing])
+            for i, result in zip(missing, computed):
+                results[i] = result
+                if result is not None:
+                    self.cache.set(keys[i], result)
+        return results
 
+    def _rule_based_svm(self, feature_array):
+        """Estimate depression probabilities from a feature matrix without the SVM model"""
+        # Normalize PHQ-9 score, then adjust for work interference and family history
+        base_prob = np.minimum(feature_array[:, 0] / 27.0, 1.0)
+        base_prob += 0.1 * feature_array[:, 1] + 0.1 * feature_array[:, 2]
+
+        return [
+            {
+                'probability': float(probability),
+                'confidence': 0.7
+            }
+            for probability in np.minimum(base_prob, 1.0)
+        ]
+
+    @metrics.timed('predictor.predict_depression_lstm')
     def predict_depression_lstm(self, text_data):
         """Make prediction using LSTM model or fallback to sentiment analysis"""
+        return self.predict_depression_lstm_batch([text_data])[0]
+
+    @metrics.timed('predictor.predict_depression_lstm_batch')
+    def predict_depression_lstm_batch(self, texts):
+        """Make predictions for many texts with one encoder/LSTM call"""
+        return self._cached_batch('lstm', texts, PredictionCache.normalize_text,
+                                  self._predict_lstm_batch)
+
+    def _predict_lstm_batch(self, texts):
         try:
-            if not self.lstm_model or not self.encoder:
+            lstm = self.numpy_lstm if self.lstm_backend == 'numpy' else self.lstm_model
+            if not lstm or not self.encoder:
                 # Fallback to TextBlob sentiment analysis
-                blob = TextBlob(text_data)
-                sentiment_score = blob.sentiment.polarity
-                
-                # Convert sentiment to depression probability
-                # Negative sentiment -> higher depression probability
-                probability = (1 - (sentiment_score + 1) / 2)
-                
-                # Determine sentiment category
-                if sentiment_score < -0.1:
+                return [self._polarity_prediction(polarity) for polarity in self.polarity.polarity_batch(texts)]
+
+            if not texts:
+                return []
+
+            # Process texts with encoder
+            encoded_texts = self.encoder.transform(list(texts))
+
+            # Get LSTM predictions for the whole batch
+            probabilities = np.asarray(lstm.predict(encoded_texts)).reshape(len(texts), -1)[:, 0]
+
+            results = []
+            for probability in probabilities:
+                probability = float(probability)
+
+                # Determine sentiment based on probability
+                if probability > 0.6:
                     sentiment = 'NEGATIVE'
-                elif sentiment_score > 0.1:
+                elif probability < 0.4:
                     sentiment = 'POSITIVE'
                 else:
                     sentiment = 'NEUTRAL'
-                
-                return {
-                    'probability': float(probability),
-                    'confidence': 0.6,
+
+                results.append({
+                    'probability': probability,
+                    'confidence': 0.78,
                     'sentiment': sentiment
-                }
-            
-            # Process text with encoder
-            encoded_text = self.encoder.transform([text_data])
-            
-            # Get LSTM prediction
-            probability = float(self.lstm_model.predict(encoded_text)[0][0])
-            
-            # Determine sentiment based on probability
-            if probability > 0.6:
-                sentiment = 'NEGATIVE'
-            elif probability < 0.4:
-                sentiment = 'POSITIVE'
-            else:
-                sentiment = 'NEUTRAL'
-            
-            return {
-                'probability': probability,
-                'confidence': 0.78,
-                'sentiment': sentiment
-            }
-            
+                })
+            return results
+
         except Exception as e:
+            if len(texts) > 1:
+                # Score one text at a time so only the failing text gets None
+                return [self._predict_lstm_batch([text])[0] for text in texts]
             print(f"Error in LSTM prediction: {str(e)}")
-            return None
+            return [None] * len(texts)
+
+    @staticmethod
+    def _polarity_prediction(sentiment_score):
+        """Estimate depression probability from TextBlob polarity"""
+        # Convert sentiment to depression probability
+        # Negative sentiment -> higher depression probability
+        probability = (1 - (sentiment_score + 1) / 2)
 
+        # Determine sentiment category
+        if sentiment_score < -0.1:
+            sentiment = 'NEGATIVE'
+        elif sentiment_score > 0.1:
+            sentiment = 'POSITIVE'
+        else:
+            sentiment = 'NEUTRAL'
+
+        return {
+            'probability': float(probability),
+            'confidence': 0.6,
+            'sentiment': sentiment
+        }
+
+    @metrics.timed('predictor.get_ensemble_prediction')
     def get_ensemble_prediction(self, features, text_data):
         """Combine predictions from both models"""
         svm_result = self.predict_depression_svm(features)
         lstm_result = self.predict_depression_lstm(text_data)
-        
-        if svm_result and lstm_result:
-            # Weighted average of probabilities (adjust weights based on your models' performance)
-            ensemble_prob = (0.6 * svm_result['probability'] + 
-                           0.4 * lstm_result['probability'])
-            
-            return {
-                'prediction': int(ensemble_prob > 0.5),
-                'probability': float(ensemble_prob),
-                'svm_prediction': svm_result,
-                'lstm_prediction': lstm_result
-            }
-        return None
+        return combine_predictions(svm_result, lstm_result)
+
+    @metrics.timed('predictor.predict_batch')
+    def predict_batch(self, features_list, texts=None):
+        """Ensemble predictions for many inputs, one vectorized call per model.
+
+        ``features_list`` and ``texts`` are parallel sequences; without
+        ``texts`` the text fields are taken from ``features_list`` itself.
+        The result list holds one ``get_ensemble_prediction``-shaped dict (or
+        None) per input, in order.
+        """
+        if texts is None:
+            texts = self.pipeline.texts(features_list)
+        if len(features_list) != len(texts):
+            raise ValueError("features_list and texts must have the same length")
+
+        svm_results = self.predict_depression_svm_batch(features_list)
+        lstm_results = self.predict_depression_lstm_batch(texts)
+        return [
+            combine_predictions(svm_result, lstm_result)
+            for svm_result, lstm_result in zip(svm_results, lstm_results)
+        ]
+
+_predictor = None
+_predictor_lock = threading.Lock()
+
+def get_predictor():
+    """Return the process-wide DepressionPredictor, creating it on first use.
+
+    Models are not loaded here; they load lazily on first prediction or when
+    ``warm_up_models`` is called.
+    """
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = DepressionPredictor()
+                if _predictor.cache is not None:
+                    metrics.register_cache('prediction', lambda: _predictor.cache.stats()['local'])
+    return _predictor
+
+def warm_up_models(names=None):
+    """Load models (all by default) into the shared predictor and return per-model load times"""
+    return get_predictor().load_models(names)
+
+def combine_predictions(svm_result, lstm_result):
+    """Combine SVM and LSTM results into an ensemble prediction"""
+    if svm_result and lstm_result:
+        # Weighted average of probabilities (adjust weights based on your models' performance)
+        ensemble_prob = (0.6 * svm_result['probability'] +
+                       0.4 * lstm_result['probability'])
+
+        return {
+            'prediction': int(ensemble_prob > 0.5),
+            'probability': float(ensemble_prob),
+            'svm_prediction': svm_result,
+            'lstm_prediction': lstm_result
+        }
+    return None
+
+_STOP = object()
+
+class BatchingPredictor:
+    """Coalesce concurrent ensemble predictions into micro-batches.
+
+    Callers block in ``get_ensemble_prediction`` while a background thread
+    collects requests for up to ``window_ms`` milliseconds (or until
+    ``max_batch_size`` requests are waiting), runs a single
+    ``DepressionPredictor.predict_batch`` call and hands each caller its
+    own result. If the batch call raises, its requests are re-run one by
+    one so an error only reaches the caller whose input caused it. Callers
+    wait at most ``timeout`` seconds; after ``close`` new requests are
+    rejected with RuntimeError.
+    """
+
+    def __init__(self, predictor, window_ms=5, max_batch_size=32, timeout=30):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predictor = predictor
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._worker = PerProcess(self._start_worker)
+        self._closed = False
+
+    def get_ensemble_prediction(self, features, text_data, timeout=None):
+        """Queue one prediction and wait for its batched result"""
+        future = Future()
+        # Queued under the lock so close() cannot slip its stop marker in first
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor is closed")
+            work_queue, _ = self._worker.get()
+            work_queue.put((features, text_data, future))
+        return future.result(self.timeout if timeout is None else timeout)
+
+    def predict_batch(self, features_list, texts):
+        """Run an already-batched job directly, bypassing the queue"""
+        return self.predictor.predict_batch(features_list, texts)
+
+    def close(self):
+        """Stop the worker thread after draining queued requests"""
+        with self._lock:
+            self._closed = True
+            worker = self._worker.pop()
+            if worker is None:
+                return
+            work_queue, thread = worker
+            work_queue.put(_STOP)
+        thread.join()
+
+    def _start_worker(self):
+        work_queue = queue.Queue()
+        thread = threading.Thread(
+            target=self._run, args=(work_queue,),
+            name='depression-predictor-batcher', daemon=True
+        )
+        thread.start()
+        return work_queue, thread
+
+    def _collect(self, work_queue, first):
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = work_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                work_queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self, work_queue):
+        while True:
+            item = work_queue.get()
+            if item is _STOP:
+                return
+            batch = self._collect(work_queue, item)
+            features_list = [features for features, _, _ in batch]
+            texts = [text_data for _, text_data, _ in batch]
+            try:
+                results = self.predictor.predict_batch(features_list, texts)
+            except Exception:
+                self._run_each(batch)
+                continue
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _run_each(self, batch):
+        """Re-run a failed batch one request at a time, so errors stay with their caller"""
+        for features, text_data, future in batch:
+            try:
+                future.set_result(self.predictor.predict_batch([features], [text_data])[0])
+            except Exception as e:
+                future.set_exception(e)
 
 def extract_features_from_form(form_data):
     """Extract relevant features from form data for ML models"""
@@ -35,6 +35,10 @@ class Assessment(db.Model):
     status = db.Column(db.String(20), nullable=True)
     family_history = db.Column(db.Boolean, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_assessment_user_date', 'user_id', 'date'),
+    )
+
     def __repr__(self):
         return f'<Assessment {self.id} for User {self.user_id}>'
 
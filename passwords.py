@@ -0,0 +1,61 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from concurrency import PerProcess
+
+class HasherBusy(Exception):
+    """Raised when too many password hashes or checks are already queued"""
+
+class PasswordHasher:
+    """Password hashing with a configurable algorithm/cost on a bounded pool.
+
+    ``method`` uses Werkzeug's syntax, e.g. ``scrypt:32768:8:1`` or
+    ``pbkdf2:sha256:600000``. Hashing and verification both run on a pool of
+    ``workers`` threads (hashlib releases the GIL, so they run in parallel)
+    and at most ``max_pending`` of them may wait at once, so a burst of
+    logins or signups uses a bounded share of the CPU instead of every
+    request thread.
+    """
+
+    def __init__(self, method='scrypt', salt_length=16, workers=None, max_pending=None):
+        self.salt_length = salt_length
+        # Werkzeug fills in default parameters; hash once to learn the full prefix
+        self.method = generate_password_hash('', method, salt_length).split('$', 1)[0]
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 8
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = PerProcess(lambda: ThreadPoolExecutor(max_workers=self.workers,
+                                                           thread_name_prefix='password-hash'))
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            method=config.PASSWORD_HASH_METHOD,
+            workers=config.PASSWORD_HASH_WORKERS,
+            max_pending=config.PASSWORD_HASH_MAX_PENDING
+        )
+
+    def hash(self, password, timeout=None):
+        """Hash ``password`` with the configured method on the hashing pool."""
+        return self._run(generate_password_hash, password, self.method, self.salt_length, timeout=timeout)
+
+    def verify(self, pwhash, password, timeout=None):
+        """Check ``password`` against ``pwhash`` on the hashing pool."""
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password, timeout=timeout)
+
+    def needs_rehash(self, pwhash):
+        """True if ``pwhash`` was made with a different algorithm or cost than configured."""
+        return not pwhash or pwhash.split('$', 1)[0] != self.method
+
+    def _run(self, fn, *args, timeout=None):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            return self._pool.get().submit(fn, *args).result(timeout)
+        finally:
+            self._slots.release()
@@ -0,0 +1,94 @@
+import argparse
+import math
+
+from sqlalchemy import func, select
+
+from app import app, db, Assessment, UserStats
+
+def compute_stats(conn):
+    """Aggregate every user's stats from the assessment table in bulk (a few grouped queries)"""
+    stats = {}
+    totals = select(
+        Assessment.user_id,
+        func.count(Assessment.id),
+        func.sum(func.coalesce(Assessment.phq9_score, 0.0)),
+        func.sum(func.coalesce(Assessment.phq9_score, 0.0) * func.coalesce(Assessment.phq9_score, 0.0)),
+        func.min(func.coalesce(Assessment.phq9_score, 0.0)),
+        func.max(func.coalesce(Assessment.phq9_score, 0.0))
+    ).group_by(Assessment.user_id)
+    for user_id, count, score_sum, score_sum_sq, min_score, max_score in conn.execute(totals):
+        stats[user_id] = {
+            'user_id': user_id, 'count': count, 'score_sum': float(score_sum),
+            'score_sum_sq': float(score_sum_sq), 'min_score': min_score, 'max_score': max_score,
+            'severity_histogram': {}
+        }
+
+    histogram = select(Assessment.user_id, Assessment.depression_severity, func.count(Assessment.id)) \
+        .group_by(Assessment.user_id, Assessment.depression_severity)
+    for user_id, severity, count in conn.execute(histogram):
+        stats[user_id]['severity_histogram'][severity] = count
+
+    # Latest assessment per user: highest (date, id), matching insertion order in the app
+    ranked = select(
+        Assessment.user_id, Assessment.id, Assessment.date, Assessment.phq9_score,
+        Assessment.depression_severity,
+        func.row_number().over(partition_by=Assessment.user_id,
+                               order_by=(Assessment.date.desc(), Assessment.id.desc())).label('rank')
+    ).subquery()
+    latest = select(ranked.c.user_id, ranked.c.id, ranked.c.date, ranked.c.phq9_score,
+                    ranked.c.depression_severity).where(ranked.c.rank == 1)
+    for user_id, assessment_id, date, score, severity in conn.execute(latest):
+        stats[user_id].update({
+            'last_assessment_id': assessment_id, 'last_date': date,
+            'last_score': score or 0.0, 'last_severity': severity
+        })
+    return stats
+
+def rebuild(conn):
+    """Replace the user_stats table with values recomputed from assessments"""
+    stats = compute_stats(conn)
+    conn.execute(UserStats.__table__.delete())
+    if stats:
+        conn.execute(UserStats.__table__.insert(), list(stats.values()))
+    return len(stats)
+
+def check(conn):
+    """Return (user_id, field, stored, expected) for every stat that has drifted"""
+    expected = compute_stats(conn)
+    stored = {row.user_id: row._asdict() for row in conn.execute(select(UserStats.__table__))}
+    mismatches = []
+    for user_id in sorted(set(expected) | set(stored)):
+        want = expected.get(user_id)
+        have = stored.get(user_id)
+        if want is None or have is None:
+            mismatches.append((user_id, 'row', have is not None, want is not None))
+            continue
+        for field, value in want.items():
+            actual = have.get(field)
+            if isinstance(value, float) and actual is not None:
+                if not math.isclose(actual, value, rel_tol=1e-9, abs_tol=1e-6):
+                    mismatches.append((user_id, field, actual, value))
+            elif actual != value:
+                mismatches.append((user_id, field, actual, value))
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or rebuild the per-user user_stats table")
+    parser.add_argument('--check', action='store_true',
+                        help="Only report users whose stored stats differ from the assessments")
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            if args.check:
+                mismatches = check(conn)
+                for user_id, field, actual, value in mismatches:
+                    print(f"user {user_id}: {field} is {actual!r}, expected {value!r}")
+                print(f"{len(mismatches)} mismatches found")
+                raise SystemExit(1 if mismatches else 0)
+            count = rebuild(conn)
+            print(f"Rebuilt stats for {count} users")
+
+if __name__ == '__main__':
+    main()
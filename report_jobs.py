@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from concurrency import PerProcess, atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+class ReportJob:
+    """One background PDF render for one user"""
+
+    def __init__(self, user_id, id=None, status=QUEUED, created=None, finished=None, path=None, error=None):
+        self.id = id or uuid.uuid4().hex
+        self.user_id = user_id
+        self.status = status
+        self.created = created if created is not None else time.time()
+        self.finished = finished
+        self.path = path
+        self.error = error
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'finished': self.finished,
+            'error': self.error
+        }
+
+    def to_record(self):
+        return dict(self.to_dict(), user_id=self.user_id, path=self.path)
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(record['user_id'], id=record['job_id'], status=record['status'], created=record['created'],
+                   finished=record['finished'], path=record['path'], error=record['error'])
+
+class ReportJobQueue:
+    """Worker pool that renders PDF reports off the request thread.
+
+    ``render(user_id)`` must return the PDF bytes (or a path to an existing
+    file); it runs on a pool thread. Job state lives in one JSON file per job
+    under ``output_dir``, so any gunicorn worker can answer status and
+    download requests for a job another worker is running. A user has at
+    most one queued or running job across all workers: submitting again
+    returns that job instead of starting a duplicate render. Jobs still
+    unfinished after ``timeout`` seconds (e.g. their worker died) count as
+    failed. Finished jobs and their files are kept for ``ttl`` seconds.
+    """
+
+    def __init__(self, render, output_dir, max_workers=2, ttl=3600, timeout=600):
+        self.render = render
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = PerProcess(lambda: ThreadPoolExecutor(max_workers=self.max_workers,
+                                                           thread_name_prefix='report-job'))
+
+    def submit(self, user_id):
+        """Queue a report for ``user_id``, or return the one already in flight"""
+        self.prune()
+        with self._user_lock(user_id):
+            marker = os.path.join(self.output_dir, f'user-{user_id}.active')
+            try:
+                with open(marker) as f:
+                    job = self.get(f.read().strip())
+            except OSError:
+                job = None
+            if job is not None and job.active:
+                return job
+            job = ReportJob(user_id)
+            self._save(job)
+            atomic_write(marker, job.id)
+        self._pool.get().submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """Return the job with this id from any worker, or None"""
+        if not JOB_ID.fullmatch(job_id or ''):
+            return None
+        try:
+            with open(self._record_path(job_id)) as f:
+                job = ReportJob.from_record(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        if job.active and job.created < time.time() - self.timeout:
+            job.status = FAILED
+            job.error = 'Report job did not finish'
+        return job
+
+    def prune(self):
+        """Forget finished (or abandoned) jobs older than ``ttl`` and delete their files"""
+        if not os.path.isdir(self.output_dir):
+            return
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.output_dir):
+            if not name.endswith('.json'):
+                continue
+            job = self.get(name[:-len('.json')])
+            if job is None or job.active or (job.finished or job.created) >= cutoff:
+                continue
+            if job.path and job.path.startswith(self.output_dir):
+                self._remove(job.path)
+            self._remove(self._record_path(job.id))
+
+    def shutdown(self, wait=True):
+        executor = self._pool.pop()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self, job):
+        job.status = RUNNING
+        self._save(job)
+        try:
+            result = self.render(job.user_id)
+            path = os.path.join(self.output_dir, f'{job.id}.pdf')
+            if isinstance(result, (bytes, bytearray)):
+                with open(path, 'wb') as f:
+                    f.write(result)
+            else:
+                # The job gets its own copy: the file it was handed may be
+                # replaced or evicted (e.g. by ReportStore) before download
+                self._link(result, path)
+            job.path = path
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            self._save(job)
+
+    @contextmanager
+    def _user_lock(self, user_id):
+        """Serialize submissions for one user across threads and worker processes"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock, open(os.path.join(self.output_dir, f'user-{user_id}.lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _record_path(self, job_id):
+        return os.path.join(self.output_dir, f'{job_id}.json')
+
+    def _save(self, job):
+        atomic_write(self._record_path(job.id), json.dumps(job.to_record()))
+
+    @staticmethod
+    def _link(source, path):
+        """Hard-link ``source`` to ``path``, copying where links are not possible"""
+        try:
+            os.link(source, path)
+        except OSError:
+            shutil.copyfile(source, path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import threading
+import time
+
+from caching import hit_stats
+from concurrency import atomic_write
+
+class ReportStore:
+    """On-disk cache of rendered PDF reports.
+
+    A report is stored under the user id and a fingerprint of the user's
+    assessment history, so it stays valid until a new assessment is added.
+    Storing a new version removes the user's older ones; ``evict`` drops
+    files older than ``max_age`` seconds and then the least recently served
+    files until the store fits in ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, max_age=7 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, user_id, fingerprint):
+        digest = hashlib.sha1(fingerprint.encode('utf8')).hexdigest()[:16]
+        return os.path.join(self.directory, f'{user_id}-{digest}.pdf')
+
+    def get(self, user_id, fingerprint):
+        """Return the path of a stored report for this history, or None"""
+        path = self.path_for(user_id, fingerprint)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return None
+        if self.max_age and stat.st_mtime < time.time() - self.max_age:
+            self.misses += 1
+            return None
+        # mtime records when the report was stored; atime when it was last
+        # served, which orders size-based eviction
+        os.utime(path, (time.time(), stat.st_mtime))
+        self.hits += 1
+        return path
+
+    def put(self, user_id, fingerprint, data):
+        """Store report bytes atomically and return the stored path"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(user_id, fingerprint)
+        atomic_write(path, data)
+
+        # Older versions for this user can never be served again
+        prefix = f'{user_id}-'
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith('.pdf') and name != os.path.basename(path):
+                self._remove(os.path.join(self.directory, name))
+        self.evict()
+        return path
+
+    def evict(self):
+        """Apply the age limit, then the size limit (least recently served first)"""
+        with self._lock:
+            files = self._files()
+            cutoff = time.time() - self.max_age if self.max_age else None
+            kept = []
+            for path, size, stored, served in files:
+                if cutoff is not None and stored < cutoff:
+                    self._remove(path)
+                else:
+                    kept.append((path, size, served))
+            total = sum(size for _, size, _ in kept)
+            for path, size, _ in sorted(kept, key=lambda entry: entry[2]):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        """Remove every stored report; return how many were removed"""
+        files = self._files()
+        for path, _, _, _ in files:
+            self._remove(path)
+        return len(files)
+
+    def bytes_stored(self):
+        return sum(size for _, size, _, _ in self._files())
+
+    def stats(self):
+        files = self._files()
+        return hit_stats(
+            self.hits, self.misses,
+            files=len(files),
+            bytes_stored=sum(size for _, size, _, _ in files),
+            max_bytes=self.max_bytes,
+            evictions=self.evictions,
+        )
+
+    def _files(self):
+        files = []
+        if not os.path.isdir(self.directory):
+            return files
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, stat.st_size, stat.st_mtime, stat.st_atime))
+        return files
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.evictions += 1
+        except OSError:
+            pass
@@ -0,0 +1,172 @@
+"""Re-score every stored assessment with the current scoring rules.
+
+Rows are read in id order in chunks, scored on a pool of worker processes
+and written back with one executemany UPDATE per chunk. Progress is
+checkpointed after every chunk, so an interrupted run picks up where it
+stopped:
+
+    python rescore.py --workers 8 --chunk-size 2000
+
+Each row gets the values the assessment form would store today:
+depression_severity from the PHQ-9 score and stored sentiment, and
+svm_confidence from calculate_svm_confidence. The form stores these
+rule-based values rather than DepressionPredictor output, and assessments
+do not store the free-text answers the LSTM needs, so rows are scored with
+the same helpers instead of ``predict_batch``; lstm_confidence and
+sentiment are left as stored. Rows without a PHQ-9 score are skipped, and
+rows stored without an svm_confidence (from /submit_assessment) keep none.
+
+A finished run is recorded as a ScoringRun, which changes every user's
+history fingerprint, so charts, history ETags and stored PDF reports made
+from the old scores are replaced; the report store is also emptied.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import bindparam, func, select, update
+
+from app import (app, db, Assessment, ScoringRun, adjust_severity_by_sentiment, calculate_svm_confidence,
+                 get_depression_severity, report_store)
+from concurrency import atomic_write
+from features import FeaturePipeline
+
+# Labelled with the names FeaturePipeline reads
+COLUMNS = (Assessment.id, Assessment.phq9_score.label('phq_score'), Assessment.age,
+           Assessment.family_history, Assessment.sentiment, Assessment.svm_confidence)
+
+# Rows that can be scored at all
+SCORED = Assessment.phq9_score.isnot(None)
+
+pipeline = FeaturePipeline()
+
+def score_chunk(chunk):
+    """Return the UPDATE parameters for one DataFrame chunk of assessment rows"""
+    scores = pipeline.phq_scores(chunk)
+    updates = []
+    rows = zip(chunk['id'].tolist(), scores.tolist(), chunk['sentiment'], chunk['svm_confidence'].isna())
+    for row_id, score, sentiment, no_confidence in rows:
+        severity = get_depression_severity(score)
+        if sentiment:
+            severity = adjust_severity_by_sentiment(severity, sentiment)
+        updates.append({
+            'row_id': row_id,
+            # The same confidence the assessment form stores, not an SVM probability
+            'svm_confidence': None if no_confidence else calculate_svm_confidence(score),
+            'depression_severity': severity
+        })
+    return updates
+
+UPDATE = update(Assessment.__table__) \
+    .where(Assessment.__table__.c.id == bindparam('row_id')) \
+    .values(svm_confidence=bindparam('svm_confidence'), depression_severity=bindparam('depression_severity'))
+
+def read_chunks(engine, after_id, chunk_size):
+    """Yield DataFrames of rows in id order, starting after ``after_id``"""
+    query = select(*COLUMNS).where(SCORED).order_by(Assessment.id).limit(chunk_size)
+    while True:
+        with engine.connect() as conn:
+            result = conn.execute(query.where(Assessment.id > after_id))
+            chunk = pd.DataFrame(result.all(), columns=list(result.keys()))
+        if chunk.empty:
+            return
+        after_id = int(chunk['id'].iloc[-1])
+        yield chunk
+
+def load_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'last_id': 0, 'rows': 0}
+
+def save_checkpoint(path, checkpoint):
+    if not path:
+        return
+    atomic_write(path, json.dumps(checkpoint))
+
+def rescore(engine, workers, chunk_size, checkpoint_path):
+    """Re-score rows after the checkpoint; return the number of rows written this run"""
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint['last_id']:
+        print(f"Resuming after assessment {checkpoint['last_id']} ({checkpoint['rows']} rows already done)")
+    with engine.connect() as conn:
+        total = conn.execute(
+            select(func.count(Assessment.id)).where(SCORED, Assessment.id > checkpoint['last_id'])).scalar()
+    print(f"{total} assessments to score with {workers} workers")
+
+    chunks = read_chunks(engine, checkpoint['last_id'], chunk_size)
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+
+    done = 0
+    started = time.perf_counter()
+    try:
+        # Keep a couple of chunks queued per worker; results are written in
+        # order so the checkpoint only ever covers finished rows
+        pending = deque()
+        for chunk in chunks:
+            if pool is None:
+                pending.append((chunk, score_chunk(chunk)))
+            else:
+                pending.append((chunk, pool.apply_async(score_chunk, (chunk,))))
+            while pending and (len(pending) >= workers * 2 or pool is None):
+                done += write_chunk(engine, pending.popleft(), checkpoint, checkpoint_path)
+                report(done, total, started)
+        while pending:
+            done += write_chunk(engine, pending.popleft(), checkpoint, checkpoint_path)
+            report(done, total, started)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return done
+
+def write_chunk(engine, item, checkpoint, checkpoint_path):
+    chunk, result = item
+    updates = result if isinstance(result, list) else result.get()
+    with engine.begin() as conn:
+        conn.execute(UPDATE, updates)
+    checkpoint['last_id'] = int(chunk['id'].iloc[-1])
+    checkpoint['rows'] += len(chunk)
+    save_checkpoint(checkpoint_path, checkpoint)
+    return len(chunk)
+
+def report(done, total, started):
+    elapsed = time.perf_counter() - started
+    print(f"  {done}/{total} rows, {done / elapsed if elapsed else 0:.0f} rows/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored assessments with the current scoring rules")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--checkpoint', default='rescore.checkpoint.json',
+                        help="Progress file used to resume an interrupted run")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    with app.app_context():
+        started = time.perf_counter()
+        done = rescore(db.engine, args.workers, args.chunk_size, args.checkpoint)
+        elapsed = time.perf_counter() - started
+
+        # Severities feed the per-user stats, so bring those back in line
+        from rebuild_stats import rebuild
+        with db.engine.begin() as conn:
+            rebuild(conn)
+            conn.execute(ScoringRun.__table__.insert().values(finished=datetime.utcnow()))
+        removed = report_store.clear()
+
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print(f"Re-scored {done} assessments in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.0f} rows/s)")
+    print(f"Removed {removed} stored reports; charts and history are re-rendered on their next view")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import re
+import threading
+import time
+from collections import namedtuple
+
+from caching import LRUCache
+
+SentimentScore = namedtuple('SentimentScore', ['positive', 'negative', 'words'])
+
+DEFAULT_NEGATIONS = frozenset([
+    'not', 'no', 'never', 'none', 'nothing', 'nobody', 'neither', 'nor', 'without',
+    'hardly', 'barely', 'cannot', "can't", 'cant', "don't", 'dont', "doesn't",
+    'doesnt', "didn't", 'didnt', "isn't", 'isnt', "wasn't", 'wasnt', "aren't",
+    "won't", 'wont', "wouldn't", "shouldn't", "couldn't", "haven't", "hasn't"
+])
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Words plus the punctuation that ends a clause (and with it any negation)
+_CLAUSE_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[,.;!?]")
+_CLAUSE_BREAKS = frozenset(',.;!?')
+
+class LexiconScorer:
+    """Single-pass, weighted keyword sentiment scorer.
+
+    The lexicon is compiled once into a dict of token sequences, so scoring
+    costs one tokenizing regex pass plus a dict lookup per token regardless
+    of lexicon size. Positive weights count towards positive sentiment,
+    negative weights towards negative; a negation word flips the sign of
+    terms within the next ``negation_window`` tokens of the same clause.
+    """
+
+    def __init__(self, weights, negations=DEFAULT_NEGATIONS, negation_window=3):
+        self.terms = {}
+        self.max_ngram = 1
+        for term, weight in weights.items():
+            tokens = tuple(_TOKEN_RE.findall(term.lower()))
+            if not tokens:
+                continue
+            self.terms[tokens[0] if len(tokens) == 1 else tokens] = float(weight)
+            self.max_ngram = max(self.max_ngram, len(tokens))
+        self.negations = frozenset(negations)
+        self.negation_window = negation_window
+        self._triggers = frozenset(
+            term if isinstance(term, str) else term[0] for term in self.terms
+        ) | self.negations | _CLAUSE_BREAKS
+
+    @classmethod
+    def from_lists(cls, positive, negative, **kwargs):
+        """Build a scorer where every positive term weighs +1 and every negative term -1"""
+        weights = {term: 1.0 for term in positive}
+        weights.update({term: -1.0 for term in negative})
+        return cls(weights, **kwargs)
+
+    def score(self, text):
+        """Return summed positive and negative weights and the word count of ``text``"""
+        tokens = _CLAUSE_TOKEN_RE.findall(text.lower())
+        terms = self.terms
+        triggers = self._triggers
+        positive = negative = 0.0
+        negate_until = -1
+        skip_until = 0
+        breaks = 0
+        # Only positions holding a lexicon term, a term's first word, a
+        # negation or clause punctuation need any further work.
+        for i in [i for i, token in enumerate(tokens) if token in triggers]:
+            token = tokens[i]
+            if token in _CLAUSE_BREAKS:
+                # "not sad, just good": the negation stops at the comma
+                breaks += 1
+                negate_until = -1
+                continue
+            if i < skip_until:
+                continue
+            weight = None
+            length = 1
+            # Prefer the longest multi-word term starting here ("not bad")
+            for size in range(min(self.max_ngram, len(tokens) - i), 1, -1):
+                weight = terms.get(tuple(tokens[i:i + size]))
+                if weight is not None:
+                    length = size
+                    break
+            if weight is None:
+                if token in self.negations:
+                    negate_until = i + self.negation_window
+                    continue
+                weight = terms.get(token)
+                if weight is None:
+                    continue
+
+            if i <= negate_until:
+                weight = -weight
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+            skip_until = i + length
+        return SentimentScore(positive, negative, len(tokens) - breaks)
+
+class PolarityAnalyzer:
+    """TextBlob polarity with one shared, pre-warmed analyzer and memoized results.
+
+    ``TextBlob(text).sentiment`` builds a blob and a new result type per call
+    and loads its lexicon on first use; this calls the same pattern analyzer
+    directly, loads it once (``warm_up``) and remembers the polarity of texts
+    it has already scored.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.cache = LRUCache(maxsize=maxsize)
+        self._analyze = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """Import TextBlob and load its lexicon now; return the seconds it took"""
+        started = time.perf_counter()
+        self._analyzer()
+        return time.perf_counter() - started
+
+    def polarity(self, text):
+        return self.polarity_batch([text])[0]
+
+    def polarity_batch(self, texts):
+        """Return the polarity (-1 to 1) of each text, scoring each distinct text once"""
+        texts = [text or '' for text in texts]
+        results = [self.cache.get(text) for text in texts]
+        missing = {text for text, result in zip(texts, results) if result is None}
+        if missing:
+            analyze = self._analyzer()
+            computed = {text: analyze(text)[0] for text in missing}
+            for text, value in computed.items():
+                self.cache.set(text, value)
+            results = [computed[text] if result is None else result for text, result in zip(texts, results)]
+        return results
+
+    def stats(self):
+        return self.cache.stats()
+
+    def _analyzer(self):
+        if self._analyze is None:
+            with self._lock:
+                if self._analyze is None:
+                    # The analyzer TextBlob.sentiment uses by default
+                    from textblob.en import sentiment as analyze
+
+                    analyze('warm up')  # loads the lexicon
+                    self._analyze = analyze
+        return self._analyze
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# app.py reads these at import: give it a throwaway database and a cheap hash
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db'))
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """The Flask app on empty tables, with its per-process caches reset"""
+    import app as app_module
+    from charts import ChartCache
+    from flask_login import FlaskLoginClient
+
+    flask_app, db = app_module.app, app_module.db
+    flask_app.config['TESTING'] = True
+    monkeypatch.setattr(flask_app, 'test_client_class', FlaskLoginClient)
+    monkeypatch.setattr(app_module, 'chart_cache', ChartCache())
+    monkeypatch.setattr(app_module.report_store, 'directory', str(tmp_path / 'report_cache'))
+    # Ids are reused once the tables are dropped
+    app_module.user_cache.clear()
+    app_module._recommendation_ids.clear()
+    app_module._recommendation_html.cache_clear()
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def user(app):
+    from app import User, db
+
+    user = User(name='tester', email='tester@example.com', gender='female', age=30, status='Student')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def client(app, user):
+    """Test client logged in as ``user``"""
+    return app.test_client(user=user)
+
+def add_assessments(user, scores, start=datetime(2024, 1, 1)):
+    """Add one assessment per score, a day apart, through add_assessment; return them"""
+    from app import Assessment, add_assessment, db, get_depression_severity
+
+    assessments = []
+    for n, score in enumerate(scores):
+        assessment = Assessment(user_id=user.id, date=start + timedelta(days=n), phq9_score=score,
+                                depression_severity=get_depression_severity(score), svm_confidence=0.8,
+                                lstm_confidence=0.5, sentiment='Neutral', age=30, status='Student')
+        add_assessment(assessment)
+        assessments.append(assessment)
+    db.session.commit()
+    return assessments
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pytest
+
+from ml_models import FEATURE_NAMES, BatchingPredictor, DepressionPredictor
+
+def make_predictor(tmp_path):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    predictor = DepressionPredictor(models_path=str(tmp_path), cache=False)
+    features = np.random.default_rng(0).random((50, len(FEATURE_NAMES))) * 20
+    labels = (features[:, 0] > 10).astype(int)
+    predictor.scaler = StandardScaler().fit(features)
+    predictor.svm_model = LogisticRegression().fit(predictor.scaler.transform(features), labels)
+    return predictor
+
+def call_concurrently(batcher, requests):
+    results = {}
+
+    def call(i, features, text):
+        try:
+            results[i] = batcher.get_ensemble_prediction(features, text)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i, *request)) for i, request in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[i] for i in range(len(requests))]
+
+def test_non_finite_row_does_not_spoil_its_batch(tmp_path):
+    predictor = make_predictor(tmp_path)
+    batcher = BatchingPredictor(predictor, window_ms=50)
+    try:
+        results = call_concurrently(batcher, [
+            ({'phq_score': 10, 'age': '30'}, 'I feel fine'),
+            ({'phq_score': 10, 'age': 'inf'}, 'I feel fine'),
+            ({'phq_score': 20, 'age': '40'}, 'I feel fine'),
+        ])
+    finally:
+        batcher.close()
+    assert results[1] is None
+    assert results[0] == predictor.get_ensemble_prediction({'phq_score': 10, 'age': '30'}, 'I feel fine')
+    assert results[2] == predictor.get_ensemble_prediction({'phq_score': 20, 'age': '40'}, 'I feel fine')
+
+class FailingPredictor:
+    """Raises for any batch holding the text 'boom'"""
+
+    def predict_batch(self, features_list, texts):
+        if 'boom' in texts:
+            raise ValueError('boom')
+        return [{'text': text} for text in texts]
+
+def test_batch_errors_reach_only_their_caller():
+    batcher = BatchingPredictor(FailingPredictor(), window_ms=50)
+    try:
+        results = call_concurrently(batcher, [({}, 'a'), ({}, 'boom'), ({}, 'b')])
+    finally:
+        batcher.close()
+    assert results[0] == {'text': 'a'}
+    assert isinstance(results[1], ValueError)
+    assert results[2] == {'text': 'b'}
+
+def test_submit_after_close_is_rejected():
+    batcher = BatchingPredictor(FailingPredictor())
+    assert batcher.get_ensemble_prediction({}, 'a') == {'text': 'a'}
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.get_ensemble_prediction({}, 'a')
@@ -0,0 +1,35 @@
+from charts import ChartCache, RenderedChart
+
+def chart(fingerprint, fmt='png'):
+    return RenderedChart(fingerprint, b'image', fmt, None)
+
+def test_new_fingerprint_replaces_the_users_chart():
+    cache = ChartCache(maxsize=2)
+    cache.put(1, chart('1:1:a'))
+    cache.put(1, chart('2:2:b'))
+    assert cache.get(1, '1:1:a') is None
+    assert cache.get(1, '2:2:b').fingerprint == '2:2:b'
+    assert cache.stats()['size'] == 1
+
+def test_evicted_users_leave_nothing_behind():
+    cache = ChartCache(maxsize=2)
+    for user_id in range(100):
+        cache.put(user_id, chart(f'{user_id}:1:a'))
+    assert cache.stats()['size'] == 2
+    assert cache.get(0, '0:1:a') is None
+
+def test_stale_lookups_count_as_misses():
+    cache = ChartCache()
+    cache.put(1, chart('1:1:a'))
+    assert cache.get(1, '2:2:b') is None
+    assert cache.get(1, '1:1:a') is not None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['stale']) == (1, 1, 1)
+
+def test_invalidate_drops_every_format():
+    cache = ChartCache()
+    cache.put(1, chart('1:1:a', 'png'))
+    cache.put(1, chart('1:1:a', 'svg'))
+    cache.invalidate(1)
+    assert cache.get(1, '1:1:a', 'png') is None
+    assert cache.get(1, '1:1:a', 'svg') is None
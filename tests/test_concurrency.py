@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from concurrency import PerProcess, atomic_write
+
+def test_atomic_write_replaces_text_and_bytes(tmp_path):
+    path = tmp_path / 'record.json'
+    atomic_write(str(path), '{"a": 1}')
+    atomic_write(str(path), b'{"a": 2}')
+    assert path.read_text() == '{"a": 2}'
+    assert os.listdir(tmp_path) == ['record.json']
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+def test_per_process_remakes_its_object_after_fork():
+    holder = PerProcess(object)
+    parent = holder.get()
+    assert holder.get() is parent
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if holder.get() is not parent else 1)
+    assert os.waitpid(pid, 0)[1] == 0
+    assert holder.pop() is parent
+    assert holder.pop() is None
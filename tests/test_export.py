@@ -0,0 +1,38 @@
+import csv
+import io
+
+from config import Config
+from conftest import add_assessments
+from export import encode
+
+def test_csv_cells_cannot_start_formulas():
+    rows = [(1, '=HYPERLINK("http://evil")', -2.5), (2, '@SUM(A1)', None), (3, 'Student', 0)]
+    text = ''.join(encode(rows, ['id', 'status', 'score'], 'csv'))
+    assert list(csv.reader(io.StringIO(text)))[1:] == [
+        ['1', '\'=HYPERLINK("http://evil")', '-2.5'], ['2', "'@SUM(A1)", ''], ['3', 'Student', '0']]
+
+def test_ndjson_keeps_values_as_they_are():
+    text = ''.join(encode([(1, '=1+1')], ['id', 'status'], 'ndjson'))
+    assert text == '{"id":1,"status":"=1+1"}\n'
+
+def test_user_export_escapes_their_own_text(client, user):
+    from app import db
+
+    assessment, = add_assessments(user, [5])
+    assessment.status = '+cmd|calc'
+    db.session.commit()
+    rows = list(csv.DictReader(io.StringIO(client.get('/export/assessments').get_data(as_text=True))))
+    assert rows[0]['status'] == "'+cmd|calc"
+
+def test_admin_export_needs_the_token(app, client, user, monkeypatch):
+    add_assessments(user, [5])
+    monkeypatch.setattr(Config, 'EXPORT_ADMIN_TOKEN', None)
+    assert client.get('/admin/export/assessments').status_code == 404
+
+    monkeypatch.setattr(Config, 'EXPORT_ADMIN_TOKEN', 'secret')
+    # Being logged in is not enough
+    assert client.get('/admin/export/assessments').status_code == 401
+    response = app.test_client().get('/admin/export/assessments?format=ndjson',
+                                     headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert len(response.get_data(as_text=True).splitlines()) == 1
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from features import FeaturePipeline
+
+FORM_A = {'phq_score': '12', 'age': '40', 'work_interference': 'often', 'family_history': 'true'}
+FORM_B = {**{f'q{i}': '2' for i in range(1, 10)}, 'self_employed': 'yes'}
+FORM_C = {'phq_score': None, 'q1': '3', 'q2': '1', 'age': 'unknown', 'family_history': 'no'}
+
+def test_batch_rows_match_single_forms():
+    pipeline = FeaturePipeline()
+    forms = [FORM_A, FORM_B, FORM_C]
+    # 30 rows also exercises the unique-value path used above SMALL_BATCH
+    for batch in (forms, forms[::-1], [FORM_B, FORM_A], forms * 10):
+        matrix = pipeline.transform(batch)
+        for row, form in zip(matrix, batch):
+            np.testing.assert_array_equal(row, pipeline.transform(form)[0])
+
+def test_missing_phq_score_falls_back_to_answers():
+    frame = pd.DataFrame({'phq_score': [7.0, np.nan], 'q1': ['1', '3'], 'q2': ['1', '2']})
+    np.testing.assert_array_equal(FeaturePipeline().phq_scores(frame), [7.0, 5.0])
+    assert FeaturePipeline().transform(FORM_C)[0, 0] == 4.0
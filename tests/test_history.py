@@ -0,0 +1,48 @@
+import json
+
+from conftest import add_assessments
+
+def test_without_paging_parameters_returns_the_whole_list(client, user):
+    add_assessments(user, [3, 12, 21])
+    response = client.get('/api/assessment_history')
+    assert response.status_code == 200
+    history = response.get_json()
+    assert isinstance(history, list)
+    assert [(item['date'], item['score']) for item in history] == [
+        ('2024-01-01', 3), ('2024-01-02', 12), ('2024-01-03', 21)]
+    assert {'date', 'score', 'depression_severity'} <= history[0].keys()
+
+def test_cursor_walks_every_row_once(client, user):
+    assessments = add_assessments(user, range(7))
+    seen = []
+    url = '/api/assessment_history?limit=3'
+    pages = 0
+    while url:
+        page = client.get(url).get_json()
+        seen.extend(item['id'] for item in page['items'])
+        pages += 1
+        url = page['next_cursor'] and f"/api/assessment_history?limit=3&cursor={page['next_cursor']}"
+    assert seen == [assessment.id for assessment in assessments]
+    assert pages == 3
+
+def test_ndjson_streams_one_object_per_line(client, user):
+    add_assessments(user, [5, 10])
+    response = client.get('/api/assessment_history?format=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['score'] for line in lines] == [5, 10]
+
+def test_unchanged_history_revalidates_with_304(client, user):
+    add_assessments(user, [5])
+    first = client.get('/api/assessment_history?limit=10')
+    assert first.headers['ETag']
+    again = client.get('/api/assessment_history?limit=10', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+    add_assessments(user, [9])
+    changed = client.get('/api/assessment_history?limit=10', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert len(changed.get_json()['items']) == 2
+
+def test_bad_cursor_is_rejected(client, user):
+    assert client.get('/api/assessment_history?cursor=nope').status_code == 400
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('h5py')
+keras = pytest.importorskip('tensorflow').keras
+
+from lstm_numpy import NumpyLSTM, check_parity
+from ml_models import export_lstm_weights, load_input_table, load_lstm_weights
+
+VOCAB_SIZE = 50
+TIMESTEPS = 12
+
+def build_model(path, mask_zero, go_backwards):
+    """Save a tiny Embedding -> LSTM -> Dense model shaped like lstm_model.h5"""
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.layers.Input((TIMESTEPS,)),
+        keras.layers.Embedding(VOCAB_SIZE, 8, mask_zero=mask_zero),
+        keras.layers.LSTM(6, go_backwards=go_backwards),
+        keras.layers.Dense(4, activation='relu'),
+        keras.layers.Dense(1, activation='sigmoid'),
+    ])
+    model.save(path)
+    return model
+
+@pytest.mark.parametrize('mask_zero', [False, True])
+@pytest.mark.parametrize('go_backwards', [False, True])
+def test_matches_keras(tmp_path, mask_zero, go_backwards):
+    h5_path = str(tmp_path / 'lstm_model.h5')
+    build_model(h5_path, mask_zero, go_backwards)
+    # check_parity pre-pads rows with zeros, exercising the mask
+    assert check_parity(h5_path, samples=32, tolerance=1e-5) <= 1e-5
+
+def test_exported_weights_match_h5(tmp_path):
+    h5_path = str(tmp_path / 'lstm_model.h5')
+    model = build_model(h5_path, mask_zero=True, go_backwards=False)
+    export_lstm_weights(h5_path, str(tmp_path / 'lstm_weights'))
+    engine = NumpyLSTM.from_layers(load_lstm_weights(str(tmp_path / 'lstm_weights')))
+
+    sequences = np.random.default_rng(1).integers(0, VOCAB_SIZE, size=(16, TIMESTEPS))
+    sequences[:, :4] = 0
+    np.testing.assert_allclose(engine.predict(sequences), model.predict(sequences, verbose=0), atol=1e-5)
+
+def test_exported_input_table_is_memory_mapped(tmp_path):
+    h5_path = str(tmp_path / 'lstm_model.h5')
+    build_model(h5_path, mask_zero=False, go_backwards=False)
+    weights_dir = str(tmp_path / 'lstm_weights')
+    export_lstm_weights(h5_path, weights_dir)
+    input_table = load_input_table(weights_dir)
+    assert isinstance(input_table, np.memmap)
+
+    layers = load_lstm_weights(weights_dir)
+    with_table = NumpyLSTM.from_layers(layers, input_table=input_table)
+    without_table = NumpyLSTM.from_layers(layers)
+    assert without_table.input_table is None
+    sequences = np.random.default_rng(2).integers(0, VOCAB_SIZE, size=(8, TIMESTEPS))
+    np.testing.assert_allclose(with_table.predict(sequences), without_table.predict(sequences), atol=1e-6)
@@ -0,0 +1,20 @@
+from config import Config
+
+def test_metrics_are_off_without_a_token(app, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', None)
+    monkeypatch.setattr(Config, 'METRICS_PUBLIC', False)
+    assert app.test_client().get('/metrics').status_code == 404
+
+def test_metrics_require_the_token(app, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', 'secret')
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+def test_metrics_can_be_opened_explicitly(app, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', None)
+    monkeypatch.setattr(Config, 'METRICS_PUBLIC', True)
+    assert app.test_client().get('/metrics').status_code == 200
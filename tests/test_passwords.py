@@ -0,0 +1,36 @@
+import threading
+
+import pytest
+
+from passwords import HasherBusy, PasswordHasher
+
+METHOD = 'pbkdf2:sha256:1000'
+
+def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(METHOD, workers=2)
+    pwhash = hasher.hash('secret')
+    assert not hasher.needs_rehash(pwhash)
+    assert hasher.verify(pwhash, 'secret')
+    assert not hasher.verify(pwhash, 'wrong')
+
+def test_hash_shares_the_bounded_pool():
+    hasher = PasswordHasher(METHOD, workers=1, max_pending=1)
+    pwhash = hasher.hash('secret')
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    waiter = threading.Thread(target=hasher._run, args=(block,))
+    waiter.start()
+    started.wait()
+    try:
+        with pytest.raises(HasherBusy):
+            hasher.hash('secret')
+        with pytest.raises(HasherBusy):
+            hasher.verify(pwhash, 'secret')
+    finally:
+        release.set()
+        waiter.join()
+    assert hasher.verify(pwhash, 'secret')
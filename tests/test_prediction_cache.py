@@ -0,0 +1,56 @@
+from ml_models import DepressionPredictor, PredictionCache
+
+FORM = {'phq_score': 12, 'age': '30', 'work_interference': 'often', 'family_history': True,
+        'self_employed': False}
+
+class CountingPolarity:
+    """Stands in for TextBlob and counts the texts it scores"""
+
+    def __init__(self):
+        self.scored = []
+
+    def polarity_batch(self, texts):
+        self.scored.extend(texts)
+        return [0.0 for _ in texts]
+
+    def warm_up(self):
+        return 0.0
+
+def make_predictor(tmp_path, cache):
+    # An empty models directory: rule-based SVM and the polarity fallback
+    return DepressionPredictor(models_path=str(tmp_path), cache=cache, polarity=CountingPolarity())
+
+def test_normalized_text_and_features_hit_the_cache(tmp_path):
+    cache = PredictionCache(maxsize=16)
+    predictor = make_predictor(tmp_path, cache)
+    first = predictor.get_ensemble_prediction(FORM, 'I feel  tired')
+    again = predictor.get_ensemble_prediction(dict(FORM), 'i FEEL tired ')
+    assert again == first
+    assert predictor.polarity.scored == ['I feel  tired']
+    stats = cache.stats()['local']
+    assert (stats['hits'], stats['misses']) == (2, 2)
+
+def test_cached_results_cannot_be_mutated_by_callers(tmp_path):
+    predictor = make_predictor(tmp_path, PredictionCache())
+    predictor.predict_depression_svm(FORM)['probability'] = -1
+    assert predictor.predict_depression_svm(FORM)['probability'] != -1
+
+def test_bounded_cache_counts_evictions(tmp_path):
+    cache = PredictionCache(maxsize=2)
+    predictor = make_predictor(tmp_path, cache)
+    for text in ('a', 'b', 'c'):
+        predictor.predict_depression_lstm(text)
+    assert cache.stats()['local']['evictions'] == 1
+
+def test_shared_store_survives_a_new_process(tmp_path):
+    shared_path = str(tmp_path / 'predictions.sqlite')
+    make_predictor(tmp_path, PredictionCache(shared_path=shared_path)).predict_depression_lstm('hello')
+    restarted = make_predictor(tmp_path, PredictionCache(shared_path=shared_path))
+    restarted.predict_depression_lstm('hello')
+    assert restarted.polarity.scored == []
+
+def test_cache_false_disables_caching(tmp_path):
+    predictor = make_predictor(tmp_path, cache=False)
+    predictor.predict_depression_lstm('hello')
+    predictor.predict_depression_lstm('hello')
+    assert predictor.polarity.scored == ['hello', 'hello']
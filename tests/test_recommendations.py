@@ -0,0 +1,30 @@
+from app import (Recommendation, _recommendation_ids, db, generate_recommendations, intern_recommendation,
+                 render_recommendation)
+
+def test_same_html_is_stored_once(app):
+    html = generate_recommendations('Moderate', 'Student', 30)
+    first = intern_recommendation(html)
+    assert intern_recommendation(html) == first
+    other = intern_recommendation('<p>Something else</p>')
+    assert other != first
+    db.session.commit()
+    assert Recommendation.query.count() == 2
+    assert render_recommendation(first) == html
+
+def test_ids_are_memoized_only_once_committed(app):
+    recommendation_id = intern_recommendation('<p>Rolled back</p>')
+    db.session.rollback()
+    assert recommendation_id not in _recommendation_ids.values()
+    assert Recommendation.query.count() == 0
+
+    recommendation_id = intern_recommendation('<p>Kept</p>')
+    assert recommendation_id not in _recommendation_ids.values()
+    db.session.commit()
+    assert recommendation_id in _recommendation_ids.values()
+
+def test_missing_recommendation_is_not_cached(app):
+    assert render_recommendation(1) is None
+    recommendation_id = intern_recommendation('<p>Added later</p>')
+    db.session.commit()
+    assert recommendation_id == 1
+    assert render_recommendation(1) == '<p>Added later</p>'
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from report_jobs import DONE, FAILED, ReportJobQueue
+
+@pytest.fixture
+def release():
+    return threading.Event()
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if not job.active:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_repeated_submits_share_the_running_job(tmp_path, release):
+    renders = []
+
+    def render(user_id):
+        renders.append(user_id)
+        release.wait(5)
+        return b'%PDF'
+
+    queue = ReportJobQueue(render, str(tmp_path))
+    # A second worker process sees the same job through the shared directory
+    other_worker = ReportJobQueue(render, str(tmp_path))
+    try:
+        job = queue.submit(1)
+        assert queue.submit(1).id == job.id
+        assert other_worker.submit(1).id == job.id
+        assert queue.submit(2).id != job.id
+        release.set()
+        finished = wait_for(queue, job.id)
+        assert finished.status == DONE
+        with open(finished.path, 'rb') as f:
+            assert f.read() == b'%PDF'
+        # Once done, a new click renders again
+        assert queue.submit(1).id != job.id
+    finally:
+        release.set()
+        queue.shutdown()
+        other_worker.shutdown()
+    assert renders.count(1) == 2
+
+def test_failed_render_is_reported(tmp_path):
+    def render(user_id):
+        raise RuntimeError('wkhtmltopdf missing')
+
+    queue = ReportJobQueue(render, str(tmp_path))
+    try:
+        job = wait_for(queue, queue.submit(1).id)
+    finally:
+        queue.shutdown()
+    assert (job.status, job.error) == (FAILED, 'wkhtmltopdf missing')
+
+def test_abandoned_job_counts_as_failed(tmp_path, release):
+    queue = ReportJobQueue(lambda user_id: release.wait(5), str(tmp_path), timeout=0)
+    try:
+        job = queue.submit(1)
+        assert queue.get(job.id).status == FAILED
+    finally:
+        release.set()
+        queue.shutdown()
+
+def test_unknown_job_ids_are_not_found(tmp_path):
+    queue = ReportJobQueue(lambda user_id: b'', str(tmp_path))
+    assert queue.get('../etc/passwd') is None
+    assert queue.get('0' * 32) is None
@@ -0,0 +1,46 @@
+import os
+import time
+
+from report_store import ReportStore
+
+def test_report_is_served_until_the_history_changes(tmp_path):
+    store = ReportStore(str(tmp_path))
+    assert store.get(1, '1:1:a:0') is None
+    path = store.put(1, '1:1:a:0', b'old')
+    assert store.get(1, '1:1:a:0') == path
+
+    store.put(1, '2:2:b:0', b'new')
+    assert store.get(1, '1:1:a:0') is None
+    assert not os.path.exists(path)
+    stats = store.stats()
+    assert (stats['files'], stats['hits'], stats['misses']) == (1, 1, 2)
+
+def test_size_limit_evicts_least_recently_served(tmp_path):
+    store = ReportStore(str(tmp_path), max_bytes=250)
+    first = store.put(1, 'a', b'x' * 100)
+    second = store.put(2, 'a', b'x' * 100)
+    # Serving user 1's report again makes user 2's the least recently served
+    now = time.time()
+    os.utime(first, (now - 10, now - 10))
+    os.utime(second, (now - 20, now - 20))
+    store.get(1, 'a')
+    store.put(3, 'a', b'x' * 100)
+    assert store.get(1, 'a') == first
+    assert store.get(2, 'a') is None
+    assert store.bytes_stored() <= 250
+
+def test_age_limit_expires_reports(tmp_path):
+    store = ReportStore(str(tmp_path), max_age=60)
+    path = store.put(1, 'a', b'pdf')
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert store.get(1, 'a') is None
+    store.evict()
+    assert not os.path.exists(path)
+
+def test_clear_removes_every_report(tmp_path):
+    store = ReportStore(str(tmp_path))
+    store.put(1, 'a', b'pdf')
+    store.put(2, 'a', b'pdf')
+    assert store.clear() == 2
+    assert store.stats()['files'] == 0
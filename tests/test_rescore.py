@@ -0,0 +1,44 @@
+import sys
+
+from conftest import add_assessments
+
+def run_rescore(monkeypatch, tmp_path):
+    import rescore
+
+    monkeypatch.setattr(sys, 'argv', ['rescore.py', '--workers', '1', '--chunk-size', '2',
+                                      '--checkpoint', str(tmp_path / 'checkpoint.json')])
+    rescore.main()
+
+def test_rescore_skips_rows_it_cannot_score(app, user, monkeypatch, tmp_path):
+    from app import Assessment, db
+
+    scored, unscored, legacy = add_assessments(user, [20, 20, 20])
+    unscored.phq9_score = None
+    unscored.depression_severity = 'Unknown'
+    # /submit_assessment stores no confidence
+    legacy.svm_confidence = None
+    for assessment in (scored, legacy):
+        assessment.depression_severity = 'Stale'
+    db.session.commit()
+
+    run_rescore(monkeypatch, tmp_path)
+    db.session.expire_all()
+    scored, unscored, legacy = Assessment.query.order_by(Assessment.id).all()
+    assert (scored.depression_severity, scored.svm_confidence) == ('Severe', 0.8)
+    assert (unscored.phq9_score, unscored.depression_severity) == (None, 'Unknown')
+    assert (legacy.depression_severity, legacy.svm_confidence) == ('Severe', None)
+
+def test_rescore_invalidates_cached_views(app, user, client, monkeypatch, tmp_path):
+    import app as app_module
+
+    add_assessments(user, [12])
+    before, _ = app_module.assessment_version(user.id)
+    history = client.get('/api/assessment_history')
+    app_module.report_store.put(user.id, before, b'%PDF')
+
+    run_rescore(monkeypatch, tmp_path)
+    after, _ = app_module.assessment_version(user.id)
+    assert after != before
+    assert app_module.report_store.stats()['files'] == 0
+    revalidated = client.get('/api/assessment_history', headers={'If-None-Match': history.headers['ETag']})
+    assert revalidated.status_code == 200
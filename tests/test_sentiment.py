@@ -0,0 +1,19 @@
+from sentiment import LexiconScorer
+
+def test_negation_flips_following_terms():
+    scorer = LexiconScorer.from_lists(['good'], ['sad'])
+    assert scorer.score("not sad today") == (1.0, 0.0, 3)
+    assert scorer.score("Not that it was ever good") == (1.0, 0.0, 6)
+
+def test_negation_stops_at_clause_punctuation():
+    scorer = LexiconScorer.from_lists(['good'], ['sad'])
+    assert scorer.score("not sad, just good") == (2.0, 0.0, 4)
+    assert scorer.score("I am not sad, just good") == (2.0, 0.0, 6)
+    assert scorer.score("I'm not sad today, I feel good") == (2.0, 0.0, 7)
+    for mark in ',.;!?':
+        assert scorer.score(f"not{mark} good") == (1.0, 0.0, 2)
+
+def test_multi_word_terms_do_not_span_punctuation():
+    scorer = LexiconScorer({'not bad': 1, 'bad': -1})
+    assert scorer.score("not bad") == (1.0, 0.0, 2)
+    assert scorer.score("not. bad") == (0.0, 1.0, 2)
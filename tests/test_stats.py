@@ -0,0 +1,42 @@
+import sys
+from datetime import datetime
+
+from conftest import add_assessments
+
+def drift(db):
+    from rebuild_stats import check
+
+    with db.engine.begin() as conn:
+        return check(conn)
+
+def test_incremental_stats_match_a_full_recompute(app, user):
+    from app import User, UserStats, db
+
+    other = User(name='other', email='other@example.com', gender='male')
+    db.session.add(other)
+    db.session.commit()
+    add_assessments(user, [3, 17, 9, 25])
+    add_assessments(other, [0])
+    assert drift(db) == []
+
+    stats = db.session.get(UserStats, user.id)
+    assert (stats.count, stats.min_score, stats.max_score, stats.last_score) == (4, 3, 25, 25)
+    assert stats.mean_score == 13.5
+
+def test_stats_stay_consistent_across_a_rescore(app, user, monkeypatch, tmp_path):
+    import rescore
+    from app import Assessment, db
+
+    add_assessments(user, [4, 14, 22])
+    # Severities out of line with the scores, as after a change to the rules
+    Assessment.query.update({'depression_severity': 'Stale'})
+    db.session.commit()
+
+    monkeypatch.setattr(sys, 'argv', ['rescore.py', '--workers', '1',
+                                      '--checkpoint', str(tmp_path / 'checkpoint.json')])
+    rescore.main()
+    db.session.expire_all()
+    assert drift(db) == []
+
+    add_assessments(user, [8], start=datetime(2024, 2, 1))
+    assert drift(db) == []
@@ -0,0 +1,32 @@
+def test_query_count_header_only_in_debug_or_testing(app, client):
+    assert 'X-Query-Count' in client.get('/dashboard').headers
+    app.config['TESTING'] = False
+    try:
+        assert 'X-Query-Count' not in client.get('/dashboard').headers
+    finally:
+        app.config['TESTING'] = True
+
+def query_count(client, path):
+    from flask import g
+
+    # Requests share the fixture's app context; forget flask-login's
+    # per-request user so each request calls load_user as in production
+    g.pop('_login_user', None)
+    return int(client.get(path).headers['X-Query-Count'])
+
+def test_cached_user_saves_a_query_per_request(app, client, user):
+    from app import user_cache
+
+    user_cache.clear()
+    cold = query_count(client, '/mindful_activities')
+    warm = query_count(client, '/mindful_activities')
+    assert (cold, warm) == (1, 0)
+    assert user_cache.stats()['hits'] >= 1
+
+def test_onboarding_invalidates_the_cached_user(app, client, user):
+    from app import user_cache
+
+    client.get('/mindful_activities')
+    assert user_cache.get(user.id).age == 30
+    client.post('/onboarding', data={'age': '41', 'status': 'Student', 'family_history': 'no'})
+    assert user_cache.get(user.id) is None